@@ -0,0 +1,180 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+# Achievements live in a small sqlite database (WAL mode, keyed by user email)
+# instead of achievements.csv, so a check-in touches one row instead of
+# rewriting the whole file and concurrent workers don't overwrite each other.
+
+CHECKIN_POINTS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS achievements (
+    user_email   TEXT PRIMARY KEY,
+    points       INTEGER NOT NULL DEFAULT 0,
+    badges       TEXT NOT NULL DEFAULT '[]',
+    last_checkin TEXT NOT NULL DEFAULT '',
+    streak       INTEGER NOT NULL DEFAULT 0,
+    rev          INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# every insert or points change stamps the row with a new, increasing rev, so
+# readers (the leaderboard) can pull just the rows changed since they last looked
+REV_SCHEMA = """
+CREATE INDEX IF NOT EXISTS achievements_rev ON achievements (rev);
+CREATE TRIGGER IF NOT EXISTS achievements_rev_insert AFTER INSERT ON achievements
+BEGIN
+    UPDATE achievements SET rev = (SELECT MAX(rev) FROM achievements) + 1 WHERE rowid = NEW.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS achievements_rev_points AFTER UPDATE OF points ON achievements
+BEGIN
+    UPDATE achievements SET rev = (SELECT MAX(rev) FROM achievements) + 1 WHERE rowid = NEW.rowid;
+END;
+"""
+
+
+def load_badges(raw):
+    try:
+        badges = json.loads(raw or '[]')
+    except (TypeError, ValueError):
+        return []
+    return badges if isinstance(badges, list) else []
+
+
+def apply_checkin(ach, today):
+    # streak/points/badge rules for one check-in; returns (status, updated row)
+    last = ach.get('last_checkin') or ''
+    streak = int(ach.get('streak') or 0)
+    points = int(ach.get('points') or 0)
+    today_str = today.isoformat()
+    if last == today_str:
+        return 'already', ach
+    try:
+        streak = streak + 1 if last and date.fromisoformat(last) == today - timedelta(days=1) else 1
+    except ValueError:
+        streak = 1
+    points += CHECKIN_POINTS
+    badges = load_badges(ach.get('badges'))
+    if points >= 100 and "Century Learner" not in badges:
+        badges.append("Century Learner")
+    if streak >= 7 and "Weekly Streak" not in badges:
+        badges.append("Weekly Streak")
+    return 'ok', dict(ach, points=points, streak=streak, last_checkin=today_str, badges=json.dumps(badges))
+
+
+def _key(email):
+    return (email or '').strip().lower()
+
+
+class AchievementStore:
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            columns = [r[1] for r in conn.execute('PRAGMA table_info(achievements)')]
+            if 'rev' not in columns:
+                # databases created before the leaderboard
+                try:
+                    conn.execute('ALTER TABLE achievements ADD COLUMN rev INTEGER NOT NULL DEFAULT 0')
+                except sqlite3.OperationalError:
+                    pass  # another worker added it first
+            conn.executescript(REV_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, email):
+        row = self._conn().execute(
+            'SELECT * FROM achievements WHERE user_email = ?', (_key(email),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def ensure(self, email):
+        conn = self._conn()
+        conn.execute('INSERT OR IGNORE INTO achievements (user_email) VALUES (?)', (_key(email),))
+        return self.get(email)
+
+    def points(self, email):
+        row = self._conn().execute(
+            'SELECT points FROM achievements WHERE user_email = ?', (_key(email),)).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def checkin(self, email, today=None):
+        # read-modify-write of a single row inside one IMMEDIATE transaction,
+        # so two workers handling the same user serialize on the write lock
+        today = today or date.today()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('INSERT OR IGNORE INTO achievements (user_email) VALUES (?)', (_key(email),))
+            ach = dict(conn.execute(
+                'SELECT * FROM achievements WHERE user_email = ?', (_key(email),)).fetchone())
+            status, ach = apply_checkin(ach, today)
+            if status == 'ok':
+                conn.execute(
+                    'UPDATE achievements SET points = ?, badges = ?, last_checkin = ?, streak = ? '
+                    'WHERE user_email = ?',
+                    (ach['points'], ach['badges'], ach['last_checkin'], ach['streak'], ach['user_email']))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return status, ach
+
+    def points_since(self, rev):
+        # (email, points, rev) for rows inserted or re-scored after rev, oldest first
+        return self._conn().execute(
+            'SELECT user_email, points, rev FROM achievements WHERE rev > ? ORDER BY rev', (rev,)).fetchall()
+
+    def all_points(self):
+        return self._conn().execute('SELECT user_email, points, rev FROM achievements').fetchall()
+
+    def migrate_from_csv(self, csv_path, force=False):
+        # one-time import of achievements.csv; rows already in the db are kept
+        conn = self._conn()
+        done = conn.execute("SELECT value FROM meta WHERE key = 'csv_migrated'").fetchone()
+        if (done and not force) or not os.path.exists(csv_path):
+            return 0
+        rows = []
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for r in csv.DictReader(f):
+                email = _key(r.get('user_email'))
+                if not email:
+                    continue
+                rows.append((email, _int(r.get('points')), r.get('badges') or '[]',
+                             r.get('last_checkin') or '', _int(r.get('streak'))))
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR IGNORE INTO achievements (user_email, points, badges, last_checkin, streak) '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_migrated', ?)",
+                         (date.today().isoformat(),))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(rows)
+
+
+def _int(value):
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
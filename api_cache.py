@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+# Serialized /api/v1 responses, cached per (catalog, data version, normalized
+# query). The ETag is derived from that key alone, so a conditional request can
+# be answered with 304 before any records are parsed or serialized. Bodies are
+# stored both plain and gzip-compressed.
+
+ApiEntry = namedtuple('ApiEntry', 'etag body gzip_body')
+
+RESERVED_ARGS = ('fields', 'cursor', 'limit', 'page')
+
+
+def normalize_args(args):
+    # stable, order-independent form of the query args
+    return tuple(sorted((k, v) for k in args for v in args.getlist(k)))
+
+
+def make_etag(catalog, version, norm_args):
+    raw = json.dumps([catalog, version, norm_args], separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def serialize(payload):
+    body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return body, gzip.compress(body, compresslevel=6)
+
+
+class ApiCache:
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def note_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def put(self, etag, payload):
+        body, gz = serialize(payload)
+        entry = ApiEntry(etag, body, gz)
+        with self._lock:
+            self._entries[etag] = entry
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'not_modified': self.not_modified}
+
+
+def filter_records(records, filters):
+    # filters: [(column, value)]; case-insensitive exact match, column names too.
+    # Raises KeyError for a column the catalog doesn't have.
+    if not filters or not records:
+        return records
+    columns = {str(c).lower(): c for c in records[0]}
+    wanted = []
+    for col, value in filters:
+        if col.lower() not in columns:
+            raise KeyError(col)
+        wanted.append((columns[col.lower()], value.strip().casefold()))
+    if hasattr(records, 'where'):
+        # mapped snapshot: match on the columns, materialize only the hits
+        return [records[i] for i in records.where(wanted)]
+    return [r for r in records if all(str(r.get(c, '')).strip().casefold() == v for c, v in wanted)]
+
+
+def select_fields(items, fields):
+    if not fields or not items:
+        return items
+    columns = {str(c).lower(): c for c in items[0]}
+    missing = [f for f in fields if f.lower() not in columns]
+    if missing:
+        raise KeyError(missing[0])
+    keep = [columns[f.lower()] for f in fields]
+    return [{k: r.get(k) for k in keep} for r in items]
@@ -1,30 +1,69 @@
 
 import os
 import csv
-import json
-import random
-import string
-import base64
-from io import BytesIO
-from datetime import datetime, date, timedelta
-
-from flask import (Flask, render_template, request, redirect, url_for, flash,
-                   session, send_from_directory, jsonify)
-from werkzeug.security import generate_password_hash, check_password_hash
-
-import pandas as pd
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import heapq
+import threading
+import click
+from collections import Counter
+from datetime import datetime, date
+
+from flask import (Flask, request, redirect, url_for, flash,
+                   session, send_from_directory, jsonify, abort, make_response)
+from flask import render_template as _render_template
+import hashing
+from hashing import HashingBusy
+
+# pandas/numpy/matplotlib are imported lazily by the modules below, on first use
+
+from catalog_cache import catalog_cache, column_values, SNAPSHOTS
+import snapshot
+from ingest import Ingest
+from related import RelatedIndex
+from deadlines import DeadlineIndex
+from linkcheck import LinkStatus, link_field, check_links
+from page_cache import PageCache
+from user_store import UserStore
+from row_writer import register_schema, append_row, SchemaError, compact
+from achievements_store import AchievementStore, load_badges
+from leaderboard import LedgerLeaderboard
+from stats import SiteStats
+import charts
+from charts import chart_cache
+from institution_search import InstitutionSearch
+from search_index import SearchIndex
+from pagination import paginate_request, paginate_cursor, version_tag, page_url
+import metrics
+from metrics import timed
+from api_cache import ApiCache, RESERVED_ARGS, normalize_args, make_etag, filter_records, select_fields
 
 # --- App setup ---
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET', 'edu-finder-secret-123')
+app.jinja_env.globals['page_url'] = page_url
+metrics.init_app(app)
+
+# timed wrappers for the hot paths reported on /metrics
+def render_template(*args, **kwargs):
+    with timed('template_render'):
+        return _render_template(*args, **kwargs)
+
+# password hashes run in the hashing pool; both raise HashingBusy when it is saturated
+def generate_password_hash(password):
+    with timed('password_hash'):
+        return hashing.hash_password(password)
+
+def check_password_hash(pw_hash, password):
+    with timed('password_hash'):
+        return hashing.verify_password(pw_hash, password)
+
+def hashing_busy():
+    resp = make_response('Too many sign-ins right now, please try again in a moment.', 503)
+    resp.headers['Retry-After'] = '2'
+    return resp
 
 # data directory
 BASE_DIR = os.path.dirname(__file__)
-DATA_DIR = os.path.join(BASE_DIR, 'data')
+DATA_DIR = os.getenv('EDUVERSE_DATA_DIR', os.path.join(BASE_DIR, 'data'))
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # CSV file paths
@@ -41,77 +80,82 @@ INTERNSHIPS_CSV = os.path.join(DATA_DIR, 'internships.csv')
 SCHOLARSHIPS_CSV = os.path.join(DATA_DIR, 'scholarships.csv')
 CODING_CSV = os.path.join(DATA_DIR, 'coding_practice.csv')
 RESOURCES_EXTRA_CSV = os.path.join(DATA_DIR, 'resources.csv')  
+ACHIEVEMENTS_DB = os.path.join(DATA_DIR, 'achievements.db')
+
+# browsable catalogs: name -> CSV path
+CATALOGS = {
+    'courses': COURSES_CSV,
+    'internships': INTERNSHIPS_CSV,
+    'hackathons': HACKATHONS_CSV,
+    'scholarships': SCHOLARSHIPS_CSV,
+    'projects': PROJECTS_CSV,
+    'blogs': BLOGS_CSV,
+    'resources': RESOURCES_CSV,
+    'faqs': FAQS_CSV,
+    'coding_practice': CODING_CSV,
+    'institutions': INSTITUTIONS_CSV,
+}
+
+# declared CSV headers (registered for row_writer validation at import; files are
+# only created by init_data, see below)
+CSV_HEADERS = {
+    USERS_CSV: ['id','name','email','password_hash','created_at'],
+    INSTITUTIONS_CSV: ['id','institution','city','country','program','level','duration_months','tuition_usd','ranking','website'],
+    RESOURCES_CSV: ['id','category','title','link','description'],
+    BLOGS_CSV: ['title','author','content','link',],
+    PROJECTS_CSV: ['title','description','link'],
+    ACHIEVEMENTS_CSV: ['user_email','points','badges','last_checkin','streak'],
+    FAQS_CSV: ['question','answer'],
+    COURSES_CSV: ['Course','Platform','Link','Description'],
+    HACKATHONS_CSV: ['Hackathon','Organizer','Link','Deadline'],
+    INTERNSHIPS_CSV: ['Company','Role','Link','Duration'],
+    SCHOLARSHIPS_CSV: ['Scholarship','Provider','Link','Eligibility'],
+    CODING_CSV: ['Platform','Link','Focus'],
+}
+for _path, _headers in CSV_HEADERS.items():
+    register_schema(_path, _headers)
 
 def ensure_csv(path, headers):
     if not os.path.exists(path):
-        df = pd.DataFrame(columns=headers)
-        df.to_csv(path, index=False)
-
-ensure_csv(USERS_CSV, ['id','name','email','password_hash','created_at'])
-ensure_csv(INSTITUTIONS_CSV, ['id','institution','city','country','program','level','duration_months','tuition_usd','ranking','website'])
-ensure_csv(RESOURCES_CSV, ['id','category','title','link','description'])
-ensure_csv(BLOGS_CSV, ['title','author','content','link',])
-ensure_csv(PROJECTS_CSV, ['title','description','link'])
-ensure_csv(ACHIEVEMENTS_CSV, ['user_email','points','badges','last_checkin','streak'])
-ensure_csv(FAQS_CSV, ['question','answer'])
-ensure_csv(COURSES_CSV, ['Course','Platform','Link','Description'])
-ensure_csv(HACKATHONS_CSV, ['Hackathon','Organizer','Link','Deadline'])
-ensure_csv(INTERNSHIPS_CSV, ['Company','Role','Link','Duration'])
-ensure_csv(SCHOLARSHIPS_CSV, ['Scholarship','Provider','Link','Eligibility'])
-ensure_csv(CODING_CSV, ['Platform','Link','Focus'])
-
-# small id generator
-def next_id(csv_path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f, lineterminator='\n').writerow(headers)
+
+def csv_has_rows(path):
+    # True if the CSV has at least one non-blank line after the header
     try:
-        df = pd.read_csv(csv_path)
-        if df.empty:
-            return 1
-        return int(df.iloc[:,0].max()) + 1
-    except Exception:
-        # fallback: count lines
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        return max(1, len(lines))
-
-# user helpers
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            return any(any(cell.strip() for cell in row) for row in reader)
+    except FileNotFoundError:
+        return False
+
+def write_csv_rows(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+# user helpers (indexed by email, new users appended to users.csv)
+user_store = UserStore(USERS_CSV)
+# dashboard aggregates, folded in incrementally as rows are appended
+site_stats = SiteStats(USERS_CSV, RESOURCES_CSV)
+
 def find_user_by_email(email):
-    df = pd.read_csv(USERS_CSV)
-    df = df.fillna('')
-    row = df[df['email'].str.lower() == email.lower()]
-    if row.empty:
-        return None
-    return row.iloc[0].to_dict()
+    return user_store.find(email)
 
 def add_user(name, email, password):
     if find_user_by_email(email):
         return False, "Email already registered"
 
-    user_id = next_id(USERS_CSV)
     pw_hash = generate_password_hash(password)
     created_at = datetime.utcnow().isoformat()
-
-    df = pd.read_csv(USERS_CSV)
-    new_row = pd.DataFrame([{
-        'id': user_id,
-        'name': name,
-        'email': email,
-        'password_hash': pw_hash,
-        'created_at': created_at
-    }])
-    df = pd.concat([df, new_row], ignore_index=True)
-    df.to_csv(USERS_CSV, index=False)
+    if user_store.add(name, email, pw_hash, created_at) is None:
+        return False, "Email already registered"
 
     # create achievement row
-    ach_df = pd.read_csv(ACHIEVEMENTS_CSV)
-    new_ach = pd.DataFrame([{
-        'user_email': email,
-        'points': 0,
-        'badges': '[]',
-        'last_checkin': '',
-        'streak': 0
-    }])
-    ach_df = pd.concat([ach_df, new_ach], ignore_index=True)
-    ach_df.to_csv(ACHIEVEMENTS_CSV, index=False)
+    achievement_store.ensure(email)
+    site_stats.users.refresh()
 
     return True, "Registered"
 
@@ -119,8 +163,7 @@ def add_user(name, email, password):
 #  sample data if empty
 def seed_sample_data():
     # Institutions
-    df = pd.read_csv(INSTITUTIONS_CSV)
-    if df.empty:
+    if not csv_has_rows(INSTITUTIONS_CSV):
         rows = [
             {'id':1,'institution':'Massachusetts Institute of Technology (MIT)','city':'Cambridge','country':'USA','program':'Computer Science','level':'Bachelors','duration_months':48,'tuition_usd':55000,'ranking':1,'website':'https://www.mit.edu'},
             {'id':2,'institution':'Stanford University','city':'Stanford','country':'USA','program':'Artificial Intelligence','level':'Masters','duration_months':24,'tuition_usd':60000,'ranking':2,'website':'https://www.stanford.edu'},
@@ -128,11 +171,10 @@ def seed_sample_data():
             {'id':4,'institution':'University of Oxford','city':'Oxford','country':'UK','program':'Data Science','level':'Masters','duration_months':12,'tuition_usd':45000,'ranking':4,'website':'https://www.ox.ac.uk'},
             {'id':5,'institution':'National University of Singapore','city':'Singapore','country':'Singapore','program':'Software Engineering','level':'Bachelors','duration_months':48,'tuition_usd':20000,'ranking':5,'website':'https://www.nus.edu.sg'},
         ]
-        pd.DataFrame(rows).to_csv(INSTITUTIONS_CSV, index=False)
+        write_csv_rows(INSTITUTIONS_CSV, rows)
 
     # Resources
-    rdf = pd.read_csv(RESOURCES_CSV)
-    if rdf.empty:
+    if not csv_has_rows(RESOURCES_CSV):
         resources = [
             {'id':1,'category':'Courses','title':'Coursera - Machine Learning (Andrew Ng)','link':'https://www.coursera.org/learn/machine-learning','description':'Classic ML course.'},
             {'id':2,'category':'Courses','title':'AWS Skill Builder','link':'https://skillbuilder.aws/','description':'AWS free and paid courses.'},
@@ -140,121 +182,222 @@ def seed_sample_data():
             {'id':4,'category':'Internships','title':'Internshala','link':'https://internshala.com','description':'Indian internships platform.'},
             {'id':5,'category':'Coding','title':'LeetCode','link':'https://leetcode.com','description':'Coding interview practice.'},
         ]
-        pd.DataFrame(resources).to_csv(RESOURCES_CSV, index=False)
+        write_csv_rows(RESOURCES_CSV, resources)
 
     # FAQs
-    faqdf = pd.read_csv(FAQS_CSV)
-    if faqdf.empty:
+    if not csv_has_rows(FAQS_CSV):
         faqs = [
             {'question':'How to apply for a course?','answer':'Check the program link and follow application instructions.'},
             {'question':'Can I submit a blog?','answer':'Yes — go to Write Blog and submit. Admin approval simulated.'}
         ]
-        pd.DataFrame(faqs).to_csv(FAQS_CSV, index=False)
+        write_csv_rows(FAQS_CSV, faqs)
 
     # Courses
-    cdf = pd.read_csv(COURSES_CSV)
-    if cdf.empty:
+    if not csv_has_rows(COURSES_CSV):
         courses = [
             {'Course':'Python for Beginners','Platform':'Coursera','Link':'https://www.coursera.org/learn/python','Description':'Learn Python basics and data structures.'},
             {'Course':'AWS Skill Builder','Platform':'AWS','Link':'https://skillbuilder.aws/','Description':'Cloud and AWS fundamentals.'},
             {'Course':'Machine Learning','Platform':'Stanford/ Coursera','Link':'https://www.coursera.org/learn/machine-learning','Description':'Andrew Ng ML course.'},
         ]
-        pd.DataFrame(courses).to_csv(COURSES_CSV, index=False)
-
-@app.route('/profile')
-def profile():
-    # Default values (if user session not set)
-    user_name = session.get('user_name', 'Student')
-    user_email = session.get('user_email', 'student@eduversex.com')
-    
-    # Example static data (can later come from DB)
-    join_date = "October 2025"
-    user_points = 125
-    achievements_count = 4
-
-    return render_template(
-        'profile.html',
-        join_date=join_date,
-        user_points=user_points,
-        achievements_count=achievements_count
-    )
+        write_csv_rows(COURSES_CSV, courses)
 
     # Hackathons
-    hdf = pd.read_csv(HACKATHONS_CSV)
-    if hdf.empty:
+    if not csv_has_rows(HACKATHONS_CSV):
         hackathons = [
             {'Hackathon':'Smart India Hackathon','Organizer':'Govt. of India','Link':'https://www.sih.gov.in','Deadline':'2025-12-15'},
             {'Hackathon':'Devpost Global','Organizer':'Devpost','Link':'https://devpost.com','Deadline':'2026-01-15'},
         ]
-        pd.DataFrame(hackathons).to_csv(HACKATHONS_CSV, index=False)
+        write_csv_rows(HACKATHONS_CSV, hackathons)
 
     # Internships
-    idf = pd.read_csv(INTERNSHIPS_CSV)
-    if idf.empty:
+    if not csv_has_rows(INTERNSHIPS_CSV):
         internships = [
             {'Company':'Google','Role':'Software Engineering Intern','Link':'https://careers.google.com/students','Duration':'3 Months'},
             {'Company':'Microsoft','Role':'AI Research Intern','Link':'https://careers.microsoft.com','Duration':'6 Months'},
         ]
-        pd.DataFrame(internships).to_csv(INTERNSHIPS_CSV, index=False)
+        write_csv_rows(INTERNSHIPS_CSV, internships)
 
     # Scholarships
-    sdf = pd.read_csv(SCHOLARSHIPS_CSV)
-    if sdf.empty:
+    if not csv_has_rows(SCHOLARSHIPS_CSV):
         scholarships = [
             {'Scholarship':'AICTE Pragati Scholarship','Provider':'AICTE','Link':'https://www.aicte-india.org','Eligibility':'Girl Students in Technical Education'},
             {'Scholarship':'Google India Scholarship','Provider':'Google','Link':'https://buildyourfuture.withgoogle.com','Eligibility':'Students in Tech Fields'},
         ]
-        pd.DataFrame(scholarships).to_csv(SCHOLARSHIPS_CSV, index=False)
+        write_csv_rows(SCHOLARSHIPS_CSV, scholarships)
 
     # Coding practice
-    codf = pd.read_csv(CODING_CSV)
-    if codf.empty:
+    if not csv_has_rows(CODING_CSV):
         coding = [
             {'Platform':'LeetCode','Link':'https://leetcode.com','Focus':'Algorithms & Data Structures'},
             {'Platform':'HackerRank','Link':'https://www.hackerrank.com','Focus':'Programming Practice'},
         ]
-        pd.DataFrame(coding).to_csv(CODING_CSV, index=False)
+        write_csv_rows(CODING_CSV, coding)
+
+# achievements ledger (sqlite, WAL) and the points ranking built from it
+achievement_store = AchievementStore(ACHIEVEMENTS_DB)
+leaderboard = LedgerLeaderboard(achievement_store)
+
+# --- data init: create missing CSVs, seed empty ones, import achievements.csv ---
+# Runs via `flask seed` at deploy time, or once per worker on its first request.
+# Set EDUVERSE_FAST_START=1 to skip the per-worker step when `flask seed` has run.
+FAST_START = os.getenv('EDUVERSE_FAST_START', '') == '1'
+_data_ready = False
+_data_lock = threading.Lock()
+
+def init_data():
+    global _data_ready
+    with _data_lock:
+        if _data_ready:
+            return
+        for path, headers in CSV_HEADERS.items():
+            ensure_csv(path, headers)
+        seed_sample_data()
+        achievement_store.migrate_from_csv(ACHIEVEMENTS_CSV)
+        leaderboard.sync()
+        if SNAPSHOTS:
+            build_snapshots()
+        search_index.refresh()
+        _data_ready = True
+
+def build_snapshots():
+    built = {}
+    for name, path in CATALOGS.items():
+        try:
+            built[name] = snapshot.build(path)
+        except Exception as e:
+            app.logger.warning('snapshot of %s failed: %s', name, e)
+    return built
+
+@app.before_request
+def boot_once():
+    if not _data_ready and not FAST_START:
+        init_data()
+
+@app.cli.command('seed')
+def seed_command():
+    init_data()
+    # quadratic in catalog size, so never on a request path
+    if related_index.stale():
+        related_index.build()
+    print(f'data ready in {DATA_DIR}')
+
+@app.route('/profile')
+def profile():
+    # Default values (if user session not set)
+    user_name = session.get('user_name', 'Student')
+    user_email = session.get('user_email', 'student@eduversex.com')
+    
+    # Example static data (can later come from DB)
+    join_date = "October 2025"
+    user_points = 125
+    achievements_count = 4
 
-    # Blogs & Projects & Achievements ensure headers but empty
-    ensure_csv(BLOGS_CSV, ['title','author','content',''])
-    ensure_csv(PROJECTS_CSV, ['title','description','link'])
-    ensure_csv(ACHIEVEMENTS_CSV, ['user_email','points','badges','last_checkin','streak'])
+    return render_template(
+        'profile.html',
+        join_date=join_date,
+        user_points=user_points,
+        achievements_count=achievements_count
+    )
+
+
+# --- charts (rendered once per data version, served from /charts/<name>.png) ---
+chart_cache.register('tuition_by_country', charts.tuition_by_country, INSTITUTIONS_CSV)
+def registrations_chart(users_csv):
+    site_stats.users.refresh()
+    return charts.daily_registrations(site_stats.registrations_per_day())
 
-seed_sample_data()
+chart_cache.register('daily_registrations', registrations_chart, USERS_CSV)
+# charts that leak site-wide stats are only served to logged-in users
+PRIVATE_CHARTS = {'daily_registrations'}
+
+def chart_url(name):
+    # url of the current rendering, or None when the chart has no data
+    chart = chart_cache.get(name)
+    if chart is None:
+        return None
+    return url_for('chart_image', name=name, v=chart.etag[:12])
+
+# institutions search index (rebuilt when institutions.csv changes)
+institution_search = InstitutionSearch(INSTITUTIONS_CSV)
+
+# serialized /api/v1 responses per data version
+api_cache = ApiCache(max_entries=int(os.getenv('API_CACHE_SIZE', '256')))
+
+metrics.register_collector('catalog_cache', catalog_cache.stats)
+metrics.register_collector('chart_cache', chart_cache.stats)
+metrics.register_collector('api_cache', api_cache.stats)
+metrics.register_collector('snapshot', snapshot.stats)
+metrics.register_collector('site', site_stats.snapshot)
+metrics.register_collector('hashing', lambda: {'rejected': hashing.pool.rejected})
+
+# full-text search over every catalog (built by init_data, catalogs reindexed when their CSV changes)
+search_index = SearchIndex(CATALOGS)
+
+# related items across catalogs, built offline (flask seed / flask related) and
+# reloaded by every worker when the saved index changes
+RELATED_CATALOGS = ('courses', 'internships', 'projects', 'institutions')
+related_index = RelatedIndex({name: CATALOGS[name] for name in RELATED_CATALOGS},
+                             os.path.join(DATA_DIR, 'related.npz'))
+metrics.register_collector('related', related_index.stats)
+
+# parsed deadlines of hackathons/scholarships, kept sorted for "closing soon" queries
+deadline_index = DeadlineIndex({'hackathons': HACKATHONS_CSV, 'scholarships': SCHOLARSHIPS_CSV})
+
+def deadline_listing(catalog):
+    # ?status=open | closing[&days=N] | range&from=YYYY-MM-DD&to=YYYY-MM-DD; default: all but expired
+    status = request.args.get('status', '')
+    if status == 'open':
+        return [item.record for item in deadline_index.open_now(catalog)]
+    if status == 'closing':
+        days = max(0, min(request.args.get('days', 30, type=int), 366))
+        return [item.record for item in deadline_index.closing_within(days, catalog)]
+    if status == 'range':
+        try:
+            first = date.fromisoformat(request.args.get('from', ''))
+            last = date.fromisoformat(request.args.get('to', ''))
+        except ValueError:
+            flash('Use dates like 2025-01-31 for the range.')
+        else:
+            return [item.record for item in deadline_index.between(first, last, catalog)]
+    return deadline_index.listing(catalog)
 
 # --- helper to load CSV to records ---
+# served from the shared catalog cache; re-parsed only when the file changes
 def load_csv_records(path):
-    try:
-        df = pd.read_csv(path)
-        df = df.fillna('')
-        return df.to_dict(orient='records')
-    except Exception:
-        return []
+    return catalog_cache.get(path)
+
+# outbound link health, written by `flask check-links`. LINK_STATUS_MODE:
+# hide (default) drops rows whose link is broken from listings, flag keeps
+# them with a marker, off ignores the status file.
+LINK_STATUS_MODE = os.getenv('LINK_STATUS_MODE', 'hide')
+LINK_CATALOGS = ('courses', 'internships', 'hackathons', 'scholarships', 'coding_practice', 'resources', 'institutions')
+link_status = LinkStatus(os.path.join(DATA_DIR, 'link_status.json'))
+metrics.register_collector('links', link_status.stats)
+
+def listed(path, records):
+    return link_status.visible(path, records) if LINK_STATUS_MODE == 'hide' else records
+
+def link_state(url):
+    return link_status.state(url) if LINK_STATUS_MODE != 'off' else ''
+
+app.jinja_env.globals['link_state'] = link_state
+
+# rendered HTML of anonymous pages, keyed on the versions of the data behind them;
+# PAGE_CACHE_DIR adds a disk tier shared by all workers
+page_cache = PageCache(max_entries=int(os.getenv('PAGE_CACHE_SIZE', '512')),
+                       max_bytes=int(os.getenv('PAGE_CACHE_BYTES', str(32 << 20))),
+                       disk_dir=os.getenv('PAGE_CACHE_DIR') or None)
+metrics.register_collector('page_cache', page_cache.stats)
 
 # --- routes ---
 @app.route('/')
+@page_cache.cached(INSTITUTIONS_CSV)
 def index():
     institutions = load_csv_records(INSTITUTIONS_CSV)
-    featured = sorted(institutions, key=lambda r: int(r.get('ranking') or 999))[:6]
-    # chart: avg tuition by country top 5
-    chart_b64 = None
-    try:
-        df = pd.read_csv(INSTITUTIONS_CSV)
-        if not df.empty:
-            agg = df.groupby('country')['tuition_usd'].mean().nlargest(5)
-            fig, ax = plt.subplots(figsize=(6,3))
-            ax.bar(agg.index, agg.values)
-            ax.set_title('Top 5 Countries by Avg Tuition (USD)')
-            plt.xticks(rotation=30)
-            buf = BytesIO()
-            plt.tight_layout()
-            fig.savefig(buf, format='png')
-            buf.seek(0)
-            chart_b64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-            plt.close(fig)
-    except Exception:
-        chart_b64 = None
-    return render_template('index.html', featured=featured, chart=chart_b64)
+    ranking = column_values(institutions, 'ranking')
+    featured = [institutions[i] for i in heapq.nsmallest(6, range(len(ranking)), key=lambda i: int(ranking[i] or 999))]
+    chart = chart_url('tuition_by_country')
+    return render_template('index.html', featured=featured, chart=chart)
 
 # auth
 @app.route('/register', methods=['GET','POST'])
@@ -266,7 +409,10 @@ def register():
         if not name or not email or not password:
             flash('Please fill all fields')
             return redirect(url_for('register'))
-        ok, msg = add_user(name, email, password)
+        try:
+            ok, msg = add_user(name, email, password)
+        except HashingBusy:
+            return hashing_busy()
         if not ok:
             flash(msg)
             return redirect(url_for('register'))
@@ -282,9 +428,19 @@ def login():
         email = request.form.get('email','').strip().lower()
         password = request.form.get('password','')
         user = find_user_by_email(email)
-        if not user or not check_password_hash(user['password_hash'], password):
+        try:
+            valid = user is not None and check_password_hash(user['password_hash'], password)
+        except HashingBusy:
+            return hashing_busy()
+        if not valid:
             flash('Invalid credentials')
             return redirect(url_for('login'))
+        # transparently move old hashes to the current cost parameters
+        if hashing.needs_rehash(user['password_hash']):
+            try:
+                user_store.update_password_hash(user['email'], generate_password_hash(password))
+            except HashingBusy:
+                pass
         session['user_email'] = user['email']
         session['user_name'] = user['name']
         flash('Logged in.')
@@ -299,72 +455,141 @@ def logout():
 
 # institutions listing/search/details
 @app.route('/institutions')
+@page_cache.cached(INSTITUTIONS_CSV)
 def institutions():
     q = request.args.get('q','').strip()
     country = request.args.get('country','').strip()
     level = request.args.get('level','').strip()
     budget = request.args.get('budget', type=float)
-    df = pd.read_csv(INSTITUTIONS_CSV)
-    if not df.empty:
-        if q:
-            df = df[df.apply(lambda r: q.lower() in str(r['program']).lower() or q.lower() in str(r['institution']).lower(), axis=1)]
-        if country:
-            df = df[df['country'].str.contains(country, case=False, na=False)]
-        if level:
-            df = df[df['level'].str.contains(level, case=False, na=False)]
-        if budget is not None:
-            df = df[df['tuition_usd'] <= budget]
-    results = df.sort_values('ranking').to_dict(orient='records') if not df.empty else []
-    return render_template('institutions.html', results=results, q=q)
+    page = paginate_request(institution_search.search(q, country, level, budget))
+    return render_template('institutions.html', results=page.items, q=q, page=page)
 
 @app.route('/details/<int:inst_id>')
+@page_cache.cached(INSTITUTIONS_CSV, related_index.path, link_status.path)
 def details(inst_id):
-    df = pd.read_csv(INSTITUTIONS_CSV)
-    row = df[df['id']==inst_id]
-    if row.empty:
+    inst = institution_search.get(inst_id)
+    if inst is None:
         flash('Institution not found.')
         return redirect(url_for('institutions'))
-    inst = row.iloc[0].to_dict()
-    return render_template('details.html', inst=inst)
+    related = related_index.related('institutions', inst_id) or []
+    return render_template('details.html', inst=inst, related=related)
 
 # resources & categories
 @app.route('/resources')
+@page_cache.cached(RESOURCES_CSV, link_status.path)
 def resources():
-    resources = load_csv_records(RESOURCES_CSV)
-    return render_template('resources.html', resources=resources)
+    page = paginate_request(listed(RESOURCES_CSV, load_csv_records(RESOURCES_CSV)))
+    return render_template('resources.html', resources=page.items, page=page)
 
 @app.route('/courses')
+@page_cache.cached(COURSES_CSV, link_status.path)
 def courses():
-    courses = load_csv_records(COURSES_CSV)
-    return render_template('courses.html', courses=courses)
+    page = paginate_request(listed(COURSES_CSV, load_csv_records(COURSES_CSV)))
+    return render_template('courses.html', courses=page.items, page=page)
 
 @app.route('/hackathons')
+@page_cache.cached(HACKATHONS_CSV, link_status.path, date.today)
 def hackathons():
-    hackathons = load_csv_records(HACKATHONS_CSV)
-    return render_template('hackathons.html', hackathons=hackathons)
+    page = paginate_request(listed(HACKATHONS_CSV, deadline_listing('hackathons')))
+    return render_template('hackathons.html', hackathons=page.items, page=page)
 
 @app.route('/internships')
+@page_cache.cached(INTERNSHIPS_CSV, link_status.path)
 def internships():
-    internships = load_csv_records(INTERNSHIPS_CSV)
-    return render_template('internships.html', internships=internships)
+    page = paginate_request(listed(INTERNSHIPS_CSV, load_csv_records(INTERNSHIPS_CSV)))
+    return render_template('internships.html', internships=page.items, page=page)
 
 @app.route('/scholarships')
+@page_cache.cached(SCHOLARSHIPS_CSV, link_status.path, date.today)
 def scholarships():
-    scholarships = load_csv_records(SCHOLARSHIPS_CSV)
-    return render_template('scholarships.html', scholarships=scholarships)
+    page = paginate_request(listed(SCHOLARSHIPS_CSV, deadline_listing('scholarships')))
+    return render_template('scholarships.html', scholarships=page.items, page=page)
 
 @app.route('/coding_practice')
+@page_cache.cached(CODING_CSV, link_status.path)
 def coding_practice():
-    coding = load_csv_records(CODING_CSV)
-    return render_template('coding_practice.html', coding=coding)
+    page = paginate_request(listed(CODING_CSV, load_csv_records(CODING_CSV)))
+    return render_template('coding_practice.html', coding=page.items, page=page)
+
+# search across all catalogs
+def run_search():
+    q = request.args.get('q','').strip()
+    catalog = request.args.get('catalog','').strip()
+    if catalog not in CATALOGS:
+        catalog = ''
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    prefix = request.args.get('prefix', '', type=str).lower() in ('1', 'true', 'yes')
+    return search_index.search(q, catalog=catalog or None, limit=limit, offset=offset, prefix=prefix)
+
+@app.route('/search')
+def search():
+    res = run_search()
+    return render_template('search.html', q=res['query'], catalog=request.args.get('catalog',''),
+                           facets=res['facets'], results=res['results'], total=res['total'])
+
+@app.route('/api/search')
+def api_search():
+    return jsonify(run_search())
+
+# JSON listing of a catalog, paged with an opaque cursor.
+#   ?fields=a,b       only return these columns
+#   ?<column>=value   case-insensitive exact match filter
+# Bodies are cached per data version; If-None-Match is answered from the ETag
+# alone and gzip bodies are precompressed.
+@app.route('/api/v1/<catalog>')
+def api_catalog(catalog):
+    path = CATALOGS.get(catalog)
+    if path is None:
+        return jsonify({'error':'unknown catalog'}), 404
+    version = version_tag(catalog_cache.version(path))
+    etag = make_etag(catalog, version, normalize_args(request.args))
+    gzip_ok = request.accept_encodings['gzip'] > 0
+    if request.if_none_match.contains(etag) or request.if_none_match.contains(etag + '-gz'):
+        api_cache.note_not_modified()
+        resp = make_response('', 304)
+    else:
+        entry = api_cache.get(etag)
+        if entry is None:
+            fields = [f.strip() for f in request.args.get('fields','').split(',') if f.strip()]
+            filters = [(k, v) for k, v in request.args.items(multi=True) if k not in RESERVED_ARGS]
+            try:
+                records = filter_records(load_csv_records(path), filters)
+                page = paginate_cursor(records, request.args.get('cursor'),
+                                       request.args.get('limit', type=int), version,
+                                       page=request.args.get('page', type=int))
+                items = select_fields(page.items, fields)
+            except ValueError as e:
+                return jsonify({'error':str(e)}), 400
+            except KeyError as e:
+                return jsonify({'error':f'unknown field: {e.args[0]}'}), 400
+            entry = api_cache.put(etag, {'catalog':catalog, 'version':version, 'total':page.total,
+                                         'items':items, 'next_cursor':page.next_cursor})
+        resp = make_response(entry.gzip_body if gzip_ok else entry.body)
+        resp.mimetype = 'application/json'
+        if gzip_ok:
+            resp.headers['Content-Encoding'] = 'gzip'
+    resp.set_etag(etag + '-gz' if gzip_ok else etag)
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.cache_control.public = True
+    resp.cache_control.no_cache = True
+    return resp
+
+@app.route('/api/related/<catalog>/<int:item_id>')
+def api_related(catalog, item_id):
+    if catalog not in RELATED_CATALOGS:
+        return jsonify({'error':'unknown catalog'}), 404
+    related = related_index.related(catalog, item_id, limit=request.args.get('limit', 5, type=int))
+    if related is None:
+        return jsonify({'error':'unknown item'}), 404
+    return jsonify({'catalog':catalog, 'id':item_id, 'related':related})
 
 # blogs
 @app.route('/blogs')
+@page_cache.cached(BLOGS_CSV)
 def blogs():
-    blogs = load_csv_records(BLOGS_CSV)
-    
-    
-    return render_template('blogs.html', blogs=blogs)
+    page = paginate_request(load_csv_records(BLOGS_CSV))
+    return render_template('blogs.html', blogs=page.items, page=page)
 
 @app.route('/write_blog', methods=['GET','POST'])
 def write_blog():
@@ -377,21 +602,23 @@ def write_blog():
         if not title or not content:
             flash('Fill title and content.')
             return redirect(url_for('write_blog'))
-        bid = next_id(BLOGS_CSV)
-        created = datetime.utcnow().isoformat()
-        df = pd.read_csv(BLOGS_CSV)
-        df = df.append({'id':bid,'user_email':session['user_email'],'title':title,'content':content,'created_at':created,'status':'Pending'}, ignore_index=True)
-        df.to_csv(BLOGS_CSV, index=False)
+        author = session.get('user_name') or session['user_email']
+        try:
+            append_row(BLOGS_CSV, {'title':title,'author':author,'content':content,'link':''})
+        except SchemaError:
+            flash('Blog storage is misconfigured, please try again later.')
+            return redirect(url_for('write_blog'))
+        catalog_cache.invalidate(BLOGS_CSV)
         flash('Blog submitted for review (simulated). You will get points if approved.')
         return redirect(url_for('blogs'))
     return render_template('write_blog.html')
 
 # projects
 @app.route('/projects')
+@page_cache.cached(PROJECTS_CSV)
 def projects():
-    projects = load_csv_records(PROJECTS_CSV)
-    
-    return render_template('projects.html', projects=projects)
+    page = paginate_request(load_csv_records(PROJECTS_CSV))
+    return render_template('projects.html', projects=page.items, page=page)
 
 @app.route('/submit_project', methods=['GET','POST'])
 def submit_project():
@@ -406,85 +633,68 @@ def submit_project():
         if not title or not description:
             flash('Fill title and description.')
             return redirect(url_for('submit_project'))
-        pid = next_id(PROJECTS_CSV)
-        created = datetime.utcnow().isoformat()
-        df = pd.read_csv(PROJECTS_CSV)
-        df = df.append({'id':pid,'user_email':session['user_email'],'title':title,'description':description,'github_link':github,'demo_link':demo,'created_at':created,'status':'Pending'}, ignore_index=True)
-        df.to_csv(PROJECTS_CSV, index=False)
+        try:
+            append_row(PROJECTS_CSV, {'title':title,'description':description,'link':github or demo})
+        except SchemaError:
+            flash('Project storage is misconfigured, please try again later.')
+            return redirect(url_for('submit_project'))
+        catalog_cache.invalidate(PROJECTS_CSV)
         flash('Project submitted for review (simulated).')
         return redirect(url_for('projects'))
     return render_template('submit_project.html')
 
-# achievements & daily check-in (CSV-backed)
+# achievements & daily check-in (sqlite ledger)
 @app.route('/achievements')
 def achievements():
     if 'user_email' not in session:
         flash('Login to view achievements.')
         return redirect(url_for('login'))
-    df = pd.read_csv(ACHIEVEMENTS_CSV)
-    row = df[df['user_email']==session['user_email']]
-    if row.empty:
-        df = df.append({'user_email':session['user_email'],'points':0,'badges':'[]','last_checkin':'','streak':0}, ignore_index=True)
-        df.to_csv(ACHIEVEMENTS_CSV, index=False)
-        row = df[df['user_email']==session['user_email']]
-    ach = row.iloc[0].to_dict()
-    try:
-        badges = json.loads(ach['badges'])
-    except Exception:
-        badges = []
+    ach = achievement_store.ensure(session['user_email'])
+    badges = load_badges(ach['badges'])
     return render_template('achievements.html', ach=ach, badges=badges)
 
 @app.route('/daily_checkin', methods=['POST'])
 def daily_checkin():
     if 'user_email' not in session:
         return jsonify({'status':'login_required'}), 401
-    df = pd.read_csv(ACHIEVEMENTS_CSV)
-    idx = df.index[df['user_email']==session['user_email']].tolist()
-    if not idx:
-        df = df.append({'user_email':session['user_email'],'points':0,'badges':'[]','last_checkin':'','streak':0}, ignore_index=True)
-        df.to_csv(ACHIEVEMENTS_CSV, index=False)
-        idx = df.index[df['user_email']==session['user_email']].tolist()
-    i = idx[0]
-    today_str = date.today().isoformat()
-    last = df.at[i,'last_checkin']
-    streak = int(df.at[i,'streak'] or 0)
-    points = int(df.at[i,'points'] or 0)
-    if last == today_str:
-        return jsonify({'status':'already','points':points,'streak':streak})
-    if last:
-        try:
-            last_date = date.fromisoformat(last)
-            if last_date == date.today() - timedelta(days=1):
-                streak += 1
-            else:
-                streak = 1
-        except:
-            streak = 1
-    else:
-        streak = 1
-    points += 10
-    df.at[i,'last_checkin'] = today_str
-    df.at[i,'streak'] = streak
-    df.at[i,'points'] = points
-    try:
-        badges = json.loads(df.at[i,'badges'])
-    except:
-        badges = []
-    if points >= 100 and "Century Learner" not in badges:
-        badges.append("Century Learner")
-    if streak >= 7 and "Weekly Streak" not in badges:
-        badges.append("Weekly Streak")
-    df.at[i,'badges'] = json.dumps(badges)
-    df.to_csv(ACHIEVEMENTS_CSV, index=False)
-    return jsonify({'status':'ok','points':points,'streak':streak,'badges':badges})
+    status, ach = achievement_store.checkin(session['user_email'])
+    leaderboard.update(ach['user_email'], ach['points'])
+    if status == 'already':
+        return jsonify({'status':'already','points':ach['points'],'streak':ach['streak']})
+    return jsonify({'status':'ok','points':ach['points'],'streak':ach['streak'],'badges':load_badges(ach['badges'])})
+
+# leaderboard
+def leaderboard_data(limit):
+    top = []
+    for rank, email, points in leaderboard.top(limit):
+        user = find_user_by_email(email)
+        top.append({'rank':rank, 'name':(user or {}).get('name') or 'Learner', 'points':points})
+    me = None
+    if 'user_email' in session:
+        mine = leaderboard.rank(session['user_email'].lower())
+        if mine:
+            me = {'rank':mine[0], 'points':mine[1]}
+    return {'top':top, 'me':me, 'total':len(leaderboard)}
+
+@app.route('/leaderboard')
+def leaderboard_page():
+    data = leaderboard_data(50)
+    return render_template('leaderboard.html', top=data['top'], me=data['me'])
+
+@app.route('/api/leaderboard')
+def api_leaderboard():
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    return jsonify(leaderboard_data(limit))
 
 # faqs, about, contact
 @app.route('/faqs')
+@page_cache.cached(FAQS_CSV)
 def faqs():
-    faqs = load_csv_records(FAQS_CSV)
-    return render_template('faqs.html', faqs=faqs)
+    page = paginate_request(load_csv_records(FAQS_CSV))
+    return render_template('faqs.html', faqs=page.items, page=page)
 
 @app.route('/about')
+@page_cache.cached()
 def about():
     return render_template('about.html')
 
@@ -505,33 +715,125 @@ def dashboard():
         flash('Login to access dashboard.')
         return redirect(url_for('login'))
     # stats
-    users = pd.read_csv(USERS_CSV)
-    total_users = len(users)
-    resources = pd.read_csv(RESOURCES_CSV)
-    categories = resources['category'].value_counts().to_dict() if not resources.empty else {}
-    users['created_at'] = pd.to_datetime(users['created_at'], errors='coerce')
-    if users['created_at'].notna().any():
-        users['date'] = users['created_at'].dt.date
-        daily = users.groupby('date').size()
-    else:
-        daily = pd.Series(dtype=int)
-    chart = None
-    if not daily.empty:
-        fig, ax = plt.subplots(figsize=(6,3))
-        daily.plot(ax=ax, marker='o')
-        ax.set_title('Daily Registrations')
-        plt.xticks(rotation=30)
-        buf = BytesIO()
-        plt.tight_layout()
-        fig.savefig(buf, format='png')
-        buf.seek(0)
-        chart = base64.b64encode(buf.getvalue()).decode('utf-8')
-        plt.close(fig)
+    site_stats.refresh()
+    total_users = site_stats.total_users()
+    categories = site_stats.resource_categories()
+    chart = chart_url('daily_registrations')
+    deadlines = deadline_index.counts()
     # my points
-    ach = pd.read_csv(ACHIEVEMENTS_CSV)
-    my_ach = ach[ach['user_email']==session['user_email']]
-    my_points = int(my_ach.iloc[0]['points']) if not my_ach.empty else 0
-    return render_template('dashboard.html', total_users=total_users, categories=categories, chart=chart, my_points=my_points)
+    my_points = achievement_store.points(session['user_email'])
+    return render_template('dashboard.html', total_users=total_users, categories=categories, chart=chart,
+                           my_points=my_points, deadlines=deadlines)
+
+@app.route('/charts/<name>.png')
+def chart_image(name):
+    if name not in chart_cache:
+        abort(404)
+    if name in PRIVATE_CHARTS and 'user_email' not in session:
+        abort(401)
+    chart = chart_cache.get(name)
+    if chart is None:
+        abort(404)
+    resp = make_response(chart.png)
+    resp.mimetype = 'image/png'
+    resp.set_etag(chart.etag)
+    if chart.last_modified:
+        resp.last_modified = chart.last_modified
+    # versioned urls (?v=<etag>) never change content, unversioned ones revalidate
+    if request.args.get('v') == chart.etag[:12]:
+        resp.cache_control.max_age = 86400
+    else:
+        resp.cache_control.no_cache = True
+    if name in PRIVATE_CHARTS:
+        resp.cache_control.private = True
+    else:
+        resp.cache_control.public = True
+    return resp.make_conditional(request)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    resp = make_response(metrics.render_prometheus())
+    resp.mimetype = 'text/plain'
+    resp.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return resp
+
+@app.cli.command('migrate-achievements')
+def migrate_achievements_command():
+    rows = achievement_store.migrate_from_csv(ACHIEVEMENTS_CSV, force=True)
+    print(f'imported {rows} achievement rows from {os.path.basename(ACHIEVEMENTS_CSV)}')
+
+@app.cli.command('snapshot')
+def snapshot_command():
+    before = snapshot.rss_bytes()
+    for name, directory in build_snapshots().items():
+        records = snapshot.SnapshotRecords(directory)
+        print(f'{name}: {len(records)} rows -> {os.path.relpath(directory, DATA_DIR)}')
+    print(f'rss {before / 2**20:.1f} MiB -> {snapshot.rss_bytes() / 2**20:.1f} MiB')
+
+@app.cli.command('related')
+def related_command():
+    items, terms = related_index.build()
+    print(f'related index: {items} items, {terms} shared terms -> {os.path.relpath(related_index.path, DATA_DIR)}')
+
+# maintenance: squeeze blank lines / superseded rows out of the append-only CSVs
+@app.cli.command('compact')
+def compact_command():
+    for path, id_field in ((USERS_CSV, 'id'), (BLOGS_CSV, None), (PROJECTS_CSV, None)):
+        rows = compact(path, id_field=id_field)
+        print(f'{os.path.basename(path)}: {rows} rows')
+
+@app.cli.command('ingest')
+@click.argument('catalog', type=click.Choice(sorted(CATALOGS)))
+@click.argument('feed', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='feed format (default: from the file extension)')
+@click.option('--chunk-rows', type=int, default=50000, show_default=True)
+def ingest_command(catalog, feed, fmt, chunk_rows):
+    path = CATALOGS[catalog]
+    ensure_csv(path, CSV_HEADERS[path])
+    job = Ingest(path, chunk_rows=chunk_rows, progress=print)
+    try:
+        stats = job.run(feed, fmt)
+    except SchemaError as e:
+        raise click.ClickException(str(e))
+    for line_no, message in job.errors:
+        print(f'  line {line_no}: {message}')
+    rate = stats['read'] / stats['seconds'] if stats['seconds'] else 0.0
+    print(f"{catalog}: {stats['read']:,} rows read, {stats['rejected']:,} rejected, "
+          f"{stats['duplicates']:,} duplicates in feed, {stats['inserted']:,} inserted, "
+          f"{stats['updated']:,} updated in {stats['seconds']:.1f}s "
+          f"({rate:,.0f} rows/s, {stats['bytes'] / 2**20 / stats['seconds'] if stats['seconds'] else 0:.1f} MiB/s)")
+
+@app.cli.command('check-links')
+@click.option('--catalog', 'catalogs', multiple=True, type=click.Choice(LINK_CATALOGS),
+              help='catalog to check (repeatable; default: all)')
+@click.option('--concurrency', type=int, default=100, show_default=True)
+@click.option('--per-host', type=int, default=4, show_default=True)
+@click.option('--timeout', type=float, default=10.0, show_default=True)
+@click.option('--retries', type=int, default=2, show_default=True)
+def check_links_command(catalogs, concurrency, per_host, timeout, retries):
+    urls = []
+    for name in catalogs or LINK_CATALOGS:
+        records = load_csv_records(CATALOGS[name])
+        field = link_field(records[0]) if records else None
+        if field:
+            urls.extend(str(r.get(field) or '').strip() for r in records)
+    urls = [u for u in dict.fromkeys(urls) if u]
+    step = max(1, len(urls) // 10)
+
+    def progress(done, total):
+        if done % step == 0 or done == total:
+            print(f'  {done}/{total} checked')
+
+    results, run = check_links(urls, progress, concurrency=concurrency, per_host=per_host,
+                               timeout=timeout, retries=retries)
+    link_status.merge(results)
+    counts = Counter(r['state'] for r in results.values())
+    print(f"{run['links']} links in {run['seconds']:.1f}s ({run['links'] / run['seconds'] if run['seconds'] else 0:.0f}/s) "
+          f"over {run['connections']} connections: {counts['ok']} ok, {counts['broken']} broken, {counts['unknown']} unknown")
+    for url, r in sorted(results.items()):
+        if r['state'] == 'broken':
+            print(f"  broken: {url} ({r['status'] or r['error']})")
 
 # static files route
 @app.route('/static/<path:filename>')
@@ -0,0 +1,240 @@
+# Load driver: concurrent clients against the app, either in-process through
+# Flask's test client or over HTTP against a local threaded WSGI server.
+# Reports p50/p95/p99 latency and throughput per route plus peak RSS, and can
+# save the result as JSON and compare it with a saved baseline. Any response
+# outside 2xx/3xx fails the run: it exits non-zero and saves nothing, so a
+# baseline never records timings of broken routes.
+#
+#   python -m bench.generate --rows 10000 --out /tmp/eduverse-bench
+#   python -m bench.driver --data /tmp/eduverse-bench --clients 8 --requests 200 --save run.json
+#   python -m bench.driver --data /tmp/eduverse-bench --baseline run.json
+
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generate import BENCH_PASSWORD, bench_email  # noqa: E402
+
+# (name, method, path, login required, form data)
+SCENARIOS = [
+    ('index', 'GET', '/', False, None),
+    ('institutions_search', 'GET', '/institutions?q=data', False, None),
+    ('institutions_filtered', 'GET', '/institutions?q=eng&country=india&budget=20000', False, None),
+    ('login', 'POST', '/login', False, 'credentials'),
+    ('daily_checkin', 'POST', '/daily_checkin', True, None),
+    ('dashboard', 'GET', '/dashboard', True, None),
+    ('resources', 'GET', '/resources', False, None),
+    ('courses', 'GET', '/courses', False, None),
+    ('hackathons', 'GET', '/hackathons', False, None),
+    ('internships', 'GET', '/internships', False, None),
+    ('scholarships', 'GET', '/scholarships', False, None),
+    ('coding_practice', 'GET', '/coding_practice', False, None),
+    ('blogs', 'GET', '/blogs', False, None),
+    ('projects', 'GET', '/projects', False, None),
+    ('faqs', 'GET', '/faqs', False, None),
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class TestClientSession:
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        resp = self.client.open(path, method=method, data=data)
+        return resp.status_code
+
+
+class HttpSession:
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data else (b'' if method == 'POST' else None)
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def run_scenario(make_session, scenario, clients, requests, user_offset):
+    name, method, path, needs_login, data = scenario
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    per_client = max(1, requests // clients)
+
+    def client(n):
+        session = make_session()
+        email = bench_email(user_offset + n + 1)
+        creds = {'email': email, 'password': BENCH_PASSWORD}
+        if needs_login:
+            session.request('POST', '/login', creds)
+        local = []
+        local_status = {}
+        for _ in range(per_client):
+            start = time.perf_counter()
+            status = session.request(method, path, creds if data == 'credentials' else data)
+            local.append(time.perf_counter() - start)
+            local_status[status] = local_status.get(status, 0) + 1
+        with lock:
+            latencies.extend(local)
+            for k, v in local_status.items():
+                statuses[k] = statuses.get(k, 0) + v
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        'status': {str(k): v for k, v in sorted(statuses.items())},
+        'errors': sum(v for k, v in statuses.items() if not 200 <= k < 400),
+    }
+
+
+def compare(result, baseline):
+    print(f'\n{"route":<24}{"p95 base":>10}{"p95 now":>10}{"change":>9}{"rps base":>10}{"rps now":>10}')
+    for name, now in result['routes'].items():
+        base = baseline.get('routes', {}).get(name)
+        if not base:
+            continue
+        change = (now['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100 if base['p95_ms'] else 0.0
+        print(f'{name:<24}{base["p95_ms"]:>10.2f}{now["p95_ms"]:>10.2f}{change:>+8.1f}%'
+              f'{base["throughput_rps"]:>10.1f}{now["throughput_rps"]:>10.1f}')
+    print(f'peak RSS: {baseline.get("peak_rss_mb")} MB -> {result["peak_rss_mb"]} MB')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', required=True, help='data directory from bench.generate')
+    parser.add_argument('--mode', choices=['testclient', 'wsgi'], default='testclient')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--routes', nargs='*', help='only run these scenarios')
+    parser.add_argument('--save', help='write the result as JSON')
+    parser.add_argument('--baseline', help='compare against a previously saved result')
+    args = parser.parse_args(argv)
+
+    os.environ['EDUVERSE_DATA_DIR'] = os.path.abspath(args.data)
+    import app as eduverse
+    # templates live next to app.py in this tree
+    eduverse.app.template_folder = eduverse.app.root_path
+    # failing routes show up in the status counts and fail the run; keep tracebacks out of the report
+    eduverse.app.logger.setLevel(logging.CRITICAL)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    start = time.perf_counter()
+    eduverse.init_data()
+    warmup = time.perf_counter() - start
+
+    server = None
+    if args.mode == 'wsgi':
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', 0, eduverse.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        make_session = lambda: HttpSession(base_url)  # noqa: E731
+    else:
+        make_session = lambda: TestClientSession(eduverse.app)  # noqa: E731
+
+    routes = {}
+    scenarios = [s for s in SCENARIOS if not args.routes or s[0] in args.routes]
+    for i, scenario in enumerate(scenarios):
+        routes[scenario[0]] = stats = run_scenario(make_session, scenario, args.clients, args.requests,
+                                                   user_offset=i * args.clients)
+        print(f'{scenario[0]:<24} p50 {stats["p50_ms"]:>8.2f} ms  p95 {stats["p95_ms"]:>8.2f} ms  '
+              f'p99 {stats["p99_ms"]:>8.2f} ms  {stats["throughput_rps"]:>8.1f} req/s  {stats["status"]}'
+              + ('  ERRORS' if stats['errors'] else ''))
+    if server is not None:
+        server.shutdown()
+
+    result = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'mode': args.mode,
+            'clients': args.clients,
+            'requests_per_route': args.requests,
+            'data': os.path.abspath(args.data),
+            'data_rows': {name: _count_rows(os.path.join(args.data, name))
+                          for name in ('users.csv', 'institutions.csv', 'internships.csv', 'projects.csv')},
+            'init_seconds': round(warmup, 3),
+        },
+        'routes': routes,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    print(f'peak RSS {result["peak_rss_mb"]} MB, init {warmup:.2f}s')
+    failed = {name: stats['status'] for name, stats in routes.items() if stats['errors']}
+    if failed:
+        for name, status in failed.items():
+            print(f'FAILED {name}: {status}')
+        if args.save:
+            print(f'not saving {args.save}: the run has failing routes')
+        return 1
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(result, json.load(f))
+    return 0
+
+
+def _count_rows(path):
+    try:
+        with open(path, 'rb') as f:
+            return max(0, sum(1 for _ in f) - 1)
+    except FileNotFoundError:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
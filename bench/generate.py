@@ -0,0 +1,155 @@
+# Synthetic data directory for benchmarks: users, institutions, internships,
+# projects and achievements at a configurable size, plus the shipped CSVs for
+# the remaining catalogs. Rows are streamed to disk, so 1M rows is fine.
+#
+#   python -m bench.generate --rows 100000 --out /tmp/eduverse-bench
+#   EDUVERSE_DATA_DIR=/tmp/eduverse-bench flask --app app seed
+
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = 'benchpass'
+
+COUNTRIES = ['India', 'USA', 'UK', 'Singapore', 'Germany', 'Canada', 'Australia', 'Japan']
+LEVELS = ['Bachelors', 'Masters', 'PhD', 'Diploma']
+PROGRAMS = ['Computer Science', 'Data Science', 'Engineering (B.Tech)', 'Artificial Intelligence',
+            'Software Engineering', 'Mechanical Engineering', 'Business Analytics', 'Physics']
+WORDS = ['Institute', 'University', 'College', 'Technology', 'National', 'State', 'Royal', 'Global']
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'Infosys', 'TCS', 'Flipkart', 'Adobe', 'Intel', 'NVIDIA', 'Zoho']
+ROLES = ['Software Engineering Intern', 'Data Science Intern', 'AI Research Intern', 'Cloud Intern',
+         'Product Intern', 'Security Intern', 'Frontend Intern', 'Backend Intern']
+TOPICS = ['ride sharing', 'chat app', 'expense tracker', 'image classifier', 'todo list', 'weather bot',
+          'portfolio site', 'quiz game', 'library system', 'stock predictor']
+
+# catalogs copied as-is from the repo
+STATIC_CATALOGS = ['courses.csv', 'hackathons.csv', 'scholarships.csv', 'coding_practice.csv',
+                   'resources.csv', 'faqs.csv', 'blogs.csv']
+
+
+def bench_password_hash():
+    # one hash of BENCH_PASSWORD reused for every user; hashing 1M passwords at
+    # 260k pbkdf2 iterations each would take hours
+    from werkzeug.security import generate_password_hash
+    return generate_password_hash(BENCH_PASSWORD)
+
+
+def bench_email(i):
+    return f'user{i}@bench.local'
+
+
+def iter_users(n, seed=1, password_hash=None):
+    rng = random.Random(seed)
+    password_hash = password_hash or bench_password_hash()
+    start = datetime(2025, 1, 1)
+    for i in range(1, n + 1):
+        created = start + timedelta(seconds=rng.randint(0, 365 * 86400))
+        yield {'id': i, 'name': f'Bench User {i}', 'email': bench_email(i),
+               'password_hash': password_hash, 'created_at': created.isoformat()}
+
+
+def iter_institutions(n, seed=7):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            'id': i + 1,
+            'institution': ' '.join(rng.sample(WORDS, 3)) + f' {i}',
+            'city': 'City',
+            'country': rng.choice(COUNTRIES) if rng.random() > 0.01 else '',
+            'program': rng.choice(PROGRAMS),
+            'level': rng.choice(LEVELS),
+            'duration_months': rng.choice([12, 24, 48]),
+            'tuition_usd': rng.randint(500, 80000) if rng.random() > 0.01 else '',
+            'ranking': rng.randint(1, n),
+            'website': f'https://inst{i}.example.edu',
+        }
+
+
+def iter_internships(n, seed=3):
+    rng = random.Random(seed)
+    for i in range(n):
+        company = rng.choice(COMPANIES)
+        yield {'Company': company, 'Role': rng.choice(ROLES),
+               'Link': f'https://careers.example.com/{company.lower()}/{i}',
+               'Duration': f'{rng.choice([8, 10, 12, 24])} Weeks'}
+
+
+def iter_projects(n, seed=5):
+    rng = random.Random(seed)
+    for i in range(n):
+        topic = rng.choice(TOPICS)
+        yield {'title': f'{topic.title()} {i}', 'description': f'A student {topic} built with Python and Flask.',
+               'link': f'https://github.com/bench/{topic.replace(" ", "-")}-{i}'}
+
+
+def iter_achievements(n, seed=9):
+    rng = random.Random(seed)
+    today = datetime(2025, 12, 31).date()
+    for i in range(1, n + 1):
+        streak = rng.randint(0, 30)
+        points = rng.randint(0, 500) // 10 * 10
+        badges = []
+        if points >= 100:
+            badges.append('Century Learner')
+        if streak >= 7:
+            badges.append('Weekly Streak')
+        yield {'user_email': bench_email(i), 'points': points, 'badges': str(badges).replace("'", '"'),
+               'last_checkin': (today - timedelta(days=rng.randint(0, 10))).isoformat() if streak else '',
+               'streak': streak}
+
+
+def write_csv(path, rows):
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row), lineterminator='\n')
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def generate(out, rows, seed=1):
+    os.makedirs(out, exist_ok=True)
+    password_hash = bench_password_hash()
+    sizes = {}
+    sizes['users.csv'] = write_csv(os.path.join(out, 'users.csv'), iter_users(rows, seed, password_hash))
+    sizes['institutions.csv'] = write_csv(os.path.join(out, 'institutions.csv'), iter_institutions(rows, seed + 6))
+    sizes['internships.csv'] = write_csv(os.path.join(out, 'internships.csv'), iter_internships(rows, seed + 2))
+    sizes['projects.csv'] = write_csv(os.path.join(out, 'projects.csv'), iter_projects(rows, seed + 4))
+    sizes['achievements.csv'] = write_csv(os.path.join(out, 'achievements.csv'), iter_achievements(rows, seed + 8))
+    for name in STATIC_CATALOGS:
+        shutil.copyfile(os.path.join(ROOT, name), os.path.join(out, name))
+    # a fresh ledger so achievements.csv gets imported on first start
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(os.path.join(out, 'achievements.db' + suffix))
+        except FileNotFoundError:
+            pass
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000, help='rows per generated catalog (1k..1M)')
+    parser.add_argument('--out', default=os.path.join(ROOT, 'bench_data'))
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    sizes = generate(args.out, args.rows, args.seed)
+    for name, count in sizes.items():
+        print(f'{name:>18}: {count} rows')
+    print(f'wrote {args.out} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Cold-start import time of app.py, measured with `python -X importtime` in a
+# fresh interpreter per run.
+#
+#   python -m bench.import_time --runs 5 --save import_time.json
+#   python -m bench.import_time --baseline import_time.json
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('pandas', 'numpy', 'matplotlib')
+
+_line_re = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module='app', fast_start=True):
+    env = dict(os.environ)
+    if fast_start:
+        env['EDUVERSE_FAST_START'] = '1'
+    code = f'import {module}, sys; print(",".join(m for m in {HEAVY!r} if m in sys.modules))'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        m = _line_re.match(line)
+        if m and not m.group(3).strip() and len(m.group(3)) == 1:
+            # top-level imports only (one space of indentation)
+            cumulative[m.group(4)] = int(m.group(2))
+    heavy = [m for m in proc.stdout.strip().split(',') if m]
+    return {'total_us': cumulative.get(module, 0), 'top_level': cumulative, 'heavy_loaded': heavy}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--no-fast-start', action='store_true')
+    parser.add_argument('--save', help='write the result as JSON')
+    parser.add_argument('--baseline', help='compare against a previously saved result')
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module, not args.no_fast_start) for _ in range(args.runs)]
+    totals = [r['total_us'] / 1000 for r in runs]
+    last = runs[-1]
+    result = {
+        'module': args.module,
+        'runs': args.runs,
+        'median_ms': round(statistics.median(totals), 2),
+        'min_ms': round(min(totals), 2),
+        'heavy_loaded': last['heavy_loaded'],
+        'slowest_imports_ms': {name: round(us / 1000, 2) for name, us in
+                               sorted(last['top_level'].items(), key=lambda kv: -kv[1])[:10]},
+    }
+    print(f"import {args.module}: median {result['median_ms']} ms, min {result['min_ms']} ms "
+          f"over {args.runs} runs")
+    print(f"heavy modules loaded at import: {', '.join(result['heavy_loaded']) or 'none'}")
+    for name, ms in result['slowest_imports_ms'].items():
+        print(f'  {ms:>8.2f} ms  {name}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+        delta = result['median_ms'] - base['median_ms']
+        print(f"baseline median {base['median_ms']} ms -> {result['median_ms']} ms ({delta:+.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Bulk ingest throughput and memory: imports a synthetic internships feed
+# (CSV and JSONL) into an empty catalog, re-imports an overlapping feed as
+# upserts and checks the resulting row count and peak RSS.
+#
+#   python -m bench.ingest --rows 1000000
+
+import argparse
+import csv
+import json
+import os
+import resource
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import Ingest  # noqa: E402
+from row_writer import register_schema  # noqa: E402
+from bench.generate import iter_internships, write_csv  # noqa: E402
+
+HEADERS = ['Company', 'Role', 'Link', 'Duration']
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def count_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def run(path, feed, label):
+    stats = Ingest(path).run(feed)
+    rate = stats['read'] / stats['seconds'] if stats['seconds'] else 0.0
+    print(f"{label}: {stats['read']:,} read, {stats['inserted']:,} inserted, {stats['updated']:,} updated, "
+          f"{stats['duplicates']:,} duplicates in {stats['seconds']:.1f}s ({rate:,.0f} rows/s), "
+          f"peak rss {peak_rss_mib():.0f} MiB")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args(argv)
+    n = args.rows
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'internships.csv')
+        register_schema(path, HEADERS)
+        feed_csv = os.path.join(tmp, 'feed.csv')
+        write_csv(feed_csv, iter_internships(n))
+        print(f'feed: {n:,} rows, {os.path.getsize(feed_csv) / 2**20:.0f} MiB, peak rss {peak_rss_mib():.0f} MiB')
+        run(path, feed_csv, 'csv insert')
+        # second feed: the upper half of the first (updates) plus as many new rows,
+        # with links differing only in host case, www. and a trailing slash
+        feed_jsonl = os.path.join(tmp, 'feed.jsonl')
+        with open(feed_jsonl, 'w', encoding='utf-8') as f:
+            for i, row in enumerate(iter_internships(n + n // 2)):
+                if i >= n // 2:
+                    row['Link'] = row['Link'].replace('careers.example.com', 'WWW.Careers.Example.com') + '/'
+                    row['Duration'] = '6 Weeks'
+                    f.write(json.dumps(row) + '\n')
+        stats = run(path, feed_jsonl, 'jsonl upsert')
+        expected = n + n // 2
+        ok = count_rows(path) == expected and stats['updated'] == n - n // 2
+        print(f'catalog rows: {count_rows(path):,} (expected {expected:,})')
+    print('OK' if ok else 'FAILED')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
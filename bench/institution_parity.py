@@ -0,0 +1,95 @@
+# Checks InstitutionIndex (over parsed records and over a mapped snapshot)
+# against the old pandas filters on the shipped institutions.csv and on a
+# synthetic catalog, and times both.
+#
+#   python -m bench.institution_parity --rows 100000
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot  # noqa: E402
+from catalog_cache import parse_csv_records  # noqa: E402
+from institution_search import InstitutionIndex  # noqa: E402
+from bench.generate import iter_institutions, write_csv  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def check_path(path, label):
+    # loaded exactly like the app loads institutions.csv
+    df = pd.read_csv(path)
+    ok = check(df, InstitutionIndex(parse_csv_records(path)), label)
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, os.path.basename(path))
+        with open(path, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        return check(df, InstitutionIndex(snapshot.load(copy)), label + ' (snapshot)') and ok
+
+
+def reference(df, q='', country='', level='', budget=None):
+    # the filters /institutions used before the index (stable sort so ties compare equal)
+    if not df.empty:
+        if q:
+            df = df[df.apply(lambda r: q.lower() in str(r['program']).lower() or q.lower() in str(r['institution']).lower(), axis=1)]
+        if country:
+            df = df[df['country'].str.contains(country, case=False, na=False)]
+        if level:
+            df = df[df['level'].str.contains(level, case=False, na=False)]
+        if budget is not None:
+            df = df[df['tuition_usd'] <= budget]
+    return df.sort_values('ranking', kind='mergesort').to_dict(orient='records') if not df.empty else []
+
+
+def queries(seed=11):
+    rng = random.Random(seed)
+    terms = ['', '', 'sci', 'Data', 'engineering', 'tech', 'iit', 'x', 'qzv', 'u', 'institute of', 'AI']
+    for _ in range(60):
+        yield (rng.choice(terms), rng.choice(['', '', 'india', 'US', 'uk', 'ger']),
+               rng.choice(['', '', 'bach', 'Masters', 'phd']),
+               rng.choice([None, None, 1000.0, 20000.0, 60000.0]))
+
+
+def ids(records):
+    return [r['id'] for r in records]
+
+
+def check(df, index, label):
+    mismatches = 0
+    t_ref = t_idx = 0.0
+    for q, country, level, budget in queries():
+        t = time.perf_counter()
+        expected = reference(df, q, country, level, budget)
+        t_ref += time.perf_counter() - t
+        t = time.perf_counter()
+        got = index.search(q, country, level, budget)
+        t_idx += time.perf_counter() - t
+        if ids(expected) != ids(got):
+            mismatches += 1
+            print(f'  mismatch q={q!r} country={country!r} level={level!r} budget={budget}')
+    print(f'{label}: {len(df)} rows, mismatches={mismatches}, '
+          f'pandas {t_ref * 1000:.1f} ms total, index {t_idx * 1000:.1f} ms total')
+    return mismatches == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args(argv)
+    ok = check_path(os.path.join(ROOT, 'institutions.csv'), 'institutions.csv')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'institutions.csv')
+        write_csv(path, iter_institutions(args.rows))
+        ok = check_path(path, 'synthetic') and ok
+    print('OK' if ok else 'FAILED')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
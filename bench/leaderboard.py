@@ -0,0 +1,66 @@
+# Leaderboard with a million users: build time, check-in updates, rank and
+# top-N queries, compared with the full sort a "top learners" view would
+# otherwise need.
+#
+#   python -m bench.leaderboard --users 1000000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard  # noqa: E402
+
+
+def per_op_us(fn, ops):
+    start = time.perf_counter()
+    for op in ops:
+        fn(op)
+    return (time.perf_counter() - start) / len(ops) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--ops', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    emails = [f'user{i}@bench.local' for i in range(args.users)]
+    points = {e: rng.randint(0, 300) * 10 for e in emails}
+
+    board = Leaderboard()
+    start = time.perf_counter()
+    for e, p in points.items():
+        board.update(e, p)
+    build = time.perf_counter() - start
+    print(f'build: {args.users} users in {build:.2f}s')
+
+    sample = [rng.choice(emails) for _ in range(args.ops)]
+
+    def checkin(e):
+        points[e] += 10
+        board.update(e, points[e])
+
+    print(f'check-in update: {per_op_us(checkin, sample):8.2f} us/op')
+    print(f'rank lookup:     {per_op_us(board.rank, sample):8.2f} us/op')
+    for n in (10, 100):
+        print(f'top {n:<4}          {per_op_us(lambda _: board.top(n), range(1000)):8.2f} us/op')
+
+    start = time.perf_counter()
+    sorted(points.items(), key=lambda kv: -kv[1])[:10]
+    print(f'full sort top 10 (no index): {(time.perf_counter() - start) * 1e6:.0f} us')
+
+    # spot-check against the brute-force answer
+    e = sample[0]
+    expected = 1 + sum(1 for p in points.values() if p > points[e])
+    assert board.rank(e) == (expected, points[e]), (board.rank(e), expected)
+    print('rank check OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# Link checker against a local stub HTTP server: thousands of links spread
+# over several loopback hosts (127.0.0.x), each answering after --latency ms.
+# Checks that every link gets the expected state and reports throughput and
+# how many connections the keep-alive pools opened.
+#
+#   python -m bench.linkcheck --links 3000
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkcheck import check_links  # noqa: E402
+
+# path prefix -> expected state
+KINDS = {
+    'ok': 'ok',          # 200
+    'gone': 'broken',    # 404
+    'nohead': 'ok',      # 405 on HEAD, 200 (chunked) on GET
+    'flaky': 'ok',       # 503 the first time, then 200
+    'redirect': 'ok',    # 301 -> /ok/
+    'close': 'ok',       # 200 with Connection: close
+    'slow': 'unknown',   # never answers within the timeout
+}
+
+
+class StubServer:
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.seen = set()
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                method, path = head.decode('latin-1').split(' ', 2)[:2]
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                kind = path.strip('/').split('/')[0]
+                status, headers, body = 200, {}, b'hello'
+                if kind == 'gone':
+                    status = 404
+                elif kind == 'nohead' and method == 'HEAD':
+                    status = 405
+                elif kind == 'flaky' and path not in self.seen:
+                    self.seen.add(path)
+                    status = 503
+                elif kind == 'redirect':
+                    status, headers = 301, {'Location': path.replace('/redirect/', '/ok/')}
+                elif kind == 'close':
+                    headers = {'Connection': 'close'}
+                elif kind == 'slow':
+                    await asyncio.sleep(3600)
+                if kind == 'nohead' and method == 'GET':
+                    headers['Transfer-Encoding'] = 'chunked'
+                    payload = b'%x\r\n%s\r\n0\r\n\r\n' % (len(body), body)
+                else:
+                    headers['Content-Length'] = str(len(body))
+                    payload = body
+                lines = [f'HTTP/1.1 {status} X'] + [f'{k}: {v}' for k, v in headers.items()]
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(payload)
+                await writer.drain()
+                if headers.get('Connection') == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def start(self):
+        ready = threading.Event()
+
+        async def serve():
+            server = await asyncio.start_server(self.handle, '0.0.0.0', 0, backlog=1024)
+            self.port = server.sockets[0].getsockname()[1]
+            ready.set()
+            await server.serve_forever()
+
+        threading.Thread(target=lambda: self.loop.run_until_complete(serve()), daemon=True).start()
+        ready.wait()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--links', type=int, default=3000)
+    parser.add_argument('--hosts', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=20.0, help='stub response time in ms')
+    parser.add_argument('--per-host', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=200)
+    args = parser.parse_args(argv)
+    server = StubServer(args.latency / 1000)
+    server.start()
+    expected = {}
+    kinds = list(KINDS)
+    for i in range(args.links):
+        kind = kinds[i % len(kinds)] if i % 100 == 0 or kinds[i % len(kinds)] != 'slow' else 'ok'
+        url = f'http://127.0.0.{1 + i % args.hosts}:{server.port}/{kind}/{i}'
+        expected[url] = KINDS[kind]
+    expected[f'http://127.0.0.1:{free_port()}/refused'] = 'broken'
+
+    results, run = check_links(list(expected), concurrency=args.concurrency, per_host=args.per_host,
+                               timeout=1.0, retries=2, backoff=0.05)
+    wrong = [(u, r) for u, r in results.items() if r['state'] != expected[u]]
+    for url, r in wrong[:10]:
+        print(f'  {url}: expected {expected[url]}, got {r}')
+    sequential = server.requests * args.latency / 1000
+    print(f"{run['links']} links, {run['requests']} requests in {run['seconds']:.2f}s "
+          f"({run['links'] / run['seconds']:.0f} links/s; ~{sequential:.0f}s one at a time)")
+    print(f"client opened {run['connections']} connections, server accepted {server.connections}")
+    print('OK' if not wrong else f'FAILED ({len(wrong)} wrong)')
+    return 0 if not wrong else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# Render time of a listing page as the catalog grows: the full-list render the
+# routes used to do vs. the paginated render they do now.
+#
+#   python -m bench.listing_render --base 250 --factors 1 10 100
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as eduverse  # noqa: E402
+from flask import render_template  # noqa: E402
+from catalog_cache import catalog_cache  # noqa: E402
+from pagination import paginate  # noqa: E402
+
+# templates live next to app.py in this tree
+eduverse.app.template_folder = eduverse.app.root_path
+
+
+def write_internships(path, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Company,Role,Link,Duration\n')
+        for i in range(rows):
+            f.write(f'Company {i},Software Engineering Intern {i},https://example.com/jobs/{i},12 Weeks\n')
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--base', type=int, default=250)
+    parser.add_argument('--factors', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f'{"rows":>8}  {"full list (ms)":>15}  {"page 1 (ms)":>12}  {"last page (ms)":>15}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.factors:
+            rows = args.base * factor
+            path = os.path.join(tmp, f'internships_{rows}.csv')
+            write_internships(path, rows)
+            records = catalog_cache.get(path)  # parse once, like a warm worker
+            with eduverse.app.test_request_context('/internships'):
+                full = timed(lambda: render_template('internships.html', internships=records), args.repeat)
+
+                def paged(n):
+                    page = paginate(records, n)
+                    return render_template('internships.html', internships=page.items, page=page)
+
+                first = timed(lambda: paged(1), args.repeat)
+                last = timed(lambda: paged(10 ** 9), args.repeat)
+            print(f'{rows:>8}  {full:>15.2f}  {first:>12.2f}  {last:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Password hashing throughput: inline on request threads (the old behaviour)
+# vs. the process pool, and how quickly an overloaded pool sheds load.
+#
+#   python -m bench.password_hashing --threads 16 --hashes 64
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashing  # noqa: E402
+from hashing import HashingBusy, HashingPool  # noqa: E402
+
+
+def drive(pool, threads, hashes):
+    done = []
+    rejected = []
+    lock = threading.Lock()
+    per_thread = max(1, hashes // threads)
+
+    def client():
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            try:
+                pool.run(hashing._generate, 'benchpass', hashing.HASH_METHOD, hashing.SALT_LENGTH)
+                bucket = done
+            except HashingBusy:
+                bucket = rejected
+            with lock:
+                bucket.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start, done, rejected
+
+
+def report(label, wall, done, rejected):
+    avg_ok = sum(done) / len(done) * 1000 if done else 0.0
+    avg_rej = sum(rejected) / len(rejected) * 1000 if rejected else 0.0
+    print(f'{label:<28} {len(done):>5} hashed  {len(done) / wall:>7.1f}/s  avg {avg_ok:>7.1f} ms'
+          f'  | {len(rejected):>5} rejected  avg {avg_rej:>6.2f} ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--hashes', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=hashing.POOL_WORKERS or 1)
+    args = parser.parse_args(argv)
+    print(f'method {hashing.HASH_METHOD}, {args.threads} threads, {args.hashes} hashes, '
+          f'{args.workers} pool workers')
+
+    inline = HashingPool(workers=0, max_pending=args.threads)
+    report('inline (request thread)', *drive(inline, args.threads, args.hashes))
+
+    pool = HashingPool(workers=args.workers, max_pending=args.threads)
+    pool.run(hashing._check, '', '')  # start the worker processes outside the timing
+    report('process pool', *drive(pool, args.threads, args.hashes))
+
+    # overload: far more concurrent requests than queue slots
+    report('process pool, saturated', *drive(HashingPool(workers=args.workers, max_pending=args.workers),
+                                             args.threads, args.hashes))
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
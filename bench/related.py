@@ -0,0 +1,88 @@
+# Builds the related-items index over synthetic catalogs, times it, checks a
+# sample of rows against brute-force float64 cosine similarity over the full
+# vocabulary and times request-time lookups.
+#
+#   python -m bench.related --rows 5000
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from related import RelatedIndex, STOPWORDS, item_text  # noqa: E402
+from search_index import tokenize  # noqa: E402
+from catalog_cache import catalog_cache  # noqa: E402
+from bench.generate import iter_institutions, iter_internships, iter_projects, write_csv  # noqa: E402
+
+
+def brute_force(docs, row, k):
+    n = len(docs)
+    tfs = [Counter(t for t in d if t not in STOPWORDS and not t.isdigit()) for d in docs]
+    df = Counter(t for tf in tfs for t in tf)
+    vecs = []
+    for tf in tfs:
+        v = {t: (1 + math.log(c)) * (math.log((1 + n) / (1 + df[t])) + 1) for t, c in tf.items()}
+        norm = math.sqrt(sum(w * w for w in v.values())) or 1
+        vecs.append({t: w / norm for t, w in v.items()})
+    q = vecs[row]
+    sims = [(sum(w * vecs[j].get(t, 0) for t, w in q.items()), j) for j in range(n) if j != row]
+    return [s for s, _ in sorted(sims, reverse=True)[:k] if s > 0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--check', type=int, default=20)
+    args = parser.parse_args(argv)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        catalogs = {}
+        for name, rows in (('institutions', iter_institutions(args.rows)),
+                           ('internships', iter_internships(args.rows)),
+                           ('projects', iter_projects(args.rows))):
+            catalogs[name] = os.path.join(tmp, f'{name}.csv')
+            write_csv(catalogs[name], rows)
+        index = RelatedIndex(catalogs, os.path.join(tmp, 'related.npz'))
+        t = time.perf_counter()
+        items, terms = index.build()
+        print(f'build: {items} items, {terms} shared terms in {time.perf_counter() - t:.2f}s')
+
+        # brute force over a small catalog sample (full vocabulary, float64)
+        small = {name: os.path.join(tmp, f'small-{name}.csv') for name in catalogs}
+        write_csv(small['institutions'], iter_institutions(300))
+        write_csv(small['internships'], iter_internships(300))
+        write_csv(small['projects'], iter_projects(300))
+        small_index = RelatedIndex(small, os.path.join(tmp, 'small.npz'))
+        small_index.build()
+        docs, keys = [], []
+        for name, path in small.items():
+            for row, record in enumerate(catalog_cache.get(path), 1):
+                docs.append(tokenize(item_text(record)))
+                keys.append((name, int(record.get('id') or row)))
+        rng = random.Random(3)
+        for row in rng.sample(range(len(docs)), args.check):
+            expected = brute_force(docs, row, 5)
+            got = [r['score'] for r in small_index.related(*keys[row])]
+            if len(got) != len(expected) or any(abs(a - b) > 1e-3 for a, b in zip(got, expected)):
+                ok = False
+                print(f'  mismatch {keys[row]}: {got} != {[round(s, 4) for s in expected]}')
+        print(f'checked {args.check} items against brute force')
+
+        lookups = [(name, i) for name in catalogs for i in range(1, args.rows + 1, max(1, args.rows // 1000))]
+        index.related(*lookups[0])
+        t = time.perf_counter()
+        for key in lookups:
+            index.related(*key)
+        print(f'lookup: {(time.perf_counter() - t) / len(lookups) * 1e6:.1f} us per item')
+    print('OK' if ok else 'FAILED')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# Per-worker memory of the catalog cache with pandas-parsed records versus
+# memory-mapped snapshots. Forks --workers processes per mode; each loads a
+# synthetic institutions + internships catalog, serves a few "requests" off
+# it (featured list, a page, a full scan) and reports RSS/PSS before loading,
+# after loading and after serving.
+# Also checks that snapshot records equal the pandas ones.
+#
+#   python -m bench.snapshot_memory --rows 200000 --workers 4
+
+import argparse
+import gc
+import heapq
+import multiprocessing
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog_cache  # noqa: E402
+import snapshot  # noqa: E402
+from bench.generate import iter_institutions, iter_internships, write_csv  # noqa: E402
+
+
+def memory():
+    # (rss, pss) in bytes; pss splits shared pages between the processes mapping them
+    rss = snapshot.rss_bytes()
+    pss = None
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    pss = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return rss, pss
+
+
+def worker(mode, paths, barrier, results):
+    cache = catalog_cache.CatalogCache()
+    catalog_cache.SNAPSHOTS = mode == 'snapshot'
+    before = memory()
+    catalogs = [cache.get(path) for path in paths]
+    loaded = memory()
+    for records in catalogs:
+        # the featured list the way / builds it: one column, six rows
+        ranking = catalog_cache.column_values(records, 'ranking')
+        featured = [records[i] for i in heapq.nsmallest(6, range(len(ranking)), key=lambda i: int(ranking[i] or 999))]
+        page = records[len(records) // 2:len(records) // 2 + 25]
+        hits = sum(1 for r in records if 'a' in str(r.get('title', r.get('program', ''))))
+        assert featured and page and hits >= 0
+        del featured, page
+    gc.collect()
+    # every worker holds its data at the same time, like a live gunicorn pool
+    barrier.wait()
+    results.put((mode, os.getpid(), before, loaded, memory()))
+    barrier.wait()
+
+
+def mib(n):
+    return '-' if n is None else f'{n / 2**20:7.1f}'
+
+
+def run(mode, paths, workers):
+    ctx = multiprocessing.get_context('fork')
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, paths, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    print(f'{mode}:')
+    total_pss = 0
+    for _, pid, before, loaded, after in rows:
+        print(f'  worker {pid}: rss {mib(before[0])} -> {mib(loaded[0])} loaded -> {mib(after[0])} served MiB, '
+              f'pss {mib(before[1])} -> {mib(loaded[1])} -> {mib(after[1])} MiB')
+        total_pss += (after[1] or 0) - (before[1] or 0)
+    print(f'  pss growth across workers: {mib(total_pss)} MiB')
+
+
+def parity(paths):
+    ok = True
+    for path in paths:
+        expected = catalog_cache.parse_csv_records(path)
+        got = snapshot.load(path)
+        same = got is not None and list(got) == expected
+        print(f'parity {os.path.basename(path)}: {len(expected)} rows, {"ok" if same else "MISMATCH"}')
+        ok = ok and same
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, 'institutions.csv'), os.path.join(tmp, 'internships.csv')]
+        write_csv(paths[0], iter_institutions(args.rows))
+        write_csv(paths[1], iter_internships(args.rows))
+        for path in paths:
+            snapshot.build(path)
+        ok = parity(paths)
+        run('pandas', paths, args.workers)
+        run('snapshot', paths, args.workers)
+    print('OK' if ok else 'FAILED')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# Many processes appending to the same CSVs at once; every row must survive
+# and every allocated id must be unique.
+#
+#   python -m bench.stress_append --procs 16 --rows 200
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from row_writer import append_row, register_schema  # noqa: E402
+from user_store import UserStore  # noqa: E402
+
+PROJECT_HEADERS = ['title', 'description', 'link']
+USER_HEADERS = ['id', 'name', 'email', 'password_hash', 'created_at']
+
+
+def _write_header(path, headers):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f, lineterminator='\n').writerow(headers)
+
+
+def worker(n, rows, projects_csv, users_csv):
+    register_schema(projects_csv, PROJECT_HEADERS)
+    register_schema(users_csv, USER_HEADERS)
+    store = UserStore(users_csv)
+    for i in range(rows):
+        append_row(projects_csv, {'title': f'p{n}-{i}', 'description': 'stress', 'link': ''})
+        # every worker also tries a shared email; only one of them may win
+        store.add(f'u{n}-{i}', f'user{n}-{i}@example.com', 'x', '2025-01-01T00:00:00')
+        store.add('dup', f'DUP{i}@example.com', 'x', '2025-01-01T00:00:00')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--procs', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        projects_csv = os.path.join(tmp, 'projects.csv')
+        users_csv = os.path.join(tmp, 'users.csv')
+        _write_header(projects_csv, PROJECT_HEADERS)
+        _write_header(users_csv, USER_HEADERS)
+
+        start = time.perf_counter()
+        procs = [Process(target=worker, args=(n, args.rows, projects_csv, users_csv))
+                 for n in range(args.procs)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        with open(projects_csv, newline='', encoding='utf-8') as f:
+            projects = list(csv.DictReader(f))
+        with open(users_csv, newline='', encoding='utf-8') as f:
+            users = list(csv.DictReader(f))
+
+        expected_projects = args.procs * args.rows
+        expected_users = args.procs * args.rows + args.rows
+        ids = [int(u['id']) for u in users]
+        emails = [u['email'].casefold() for u in users]
+        ok = (len(projects) == expected_projects
+              and len({p['title'] for p in projects}) == expected_projects
+              and len(users) == expected_users
+              and sorted(ids) == list(range(1, expected_users + 1))
+              and len(set(emails)) == len(emails))
+
+        total = expected_projects + args.procs * args.rows * 2
+        print(f'projects: {len(projects)}/{expected_projects}  users: {len(users)}/{expected_users}')
+        print(f'{total} writes from {args.procs} processes in {elapsed:.2f}s '
+              f'({total / elapsed:.0f} writes/s)')
+        print('OK' if ok else 'FAILED: rows lost or ids duplicated')
+        return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from metrics import timed
+
+# CATALOG_SNAPSHOTS=1 maps compiled snapshots (see snapshot.py) instead of
+# parsing the CSVs with pandas in every worker
+SNAPSHOTS = os.getenv('CATALOG_SNAPSHOTS', '0') == '1'
+
+
+def file_signature(path):
+    # (mtime, size) of a CSV; None when the file is missing
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def parse_csv_records(path):
+    import pandas as pd  # deferred: keeps app import fast
+    try:
+        with timed('csv_read'):
+            df = pd.read_csv(path)
+        df = df.fillna('')
+        return df.to_dict(orient='records')
+    except Exception:
+        return []
+
+
+def load_records(path):
+    if SNAPSHOTS:
+        import snapshot
+        records = snapshot.load(path)
+        if records is not None:
+            return records
+    return parse_csv_records(path)
+
+
+def column_values(records, name):
+    # one column of a record list; snapshots read it without building rows
+    if hasattr(records, 'values'):
+        try:
+            return records.values(name)
+        except KeyError:
+            return [''] * len(records)
+    return [r.get(name, '') for r in records]
+
+
+class RecordView(Sequence):
+    # the rows of a record list at the given positions, fetched on access, so
+    # a filtered listing can be paginated without building every row
+
+    def __init__(self, records, positions):
+        self.records = records
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.records[i] for i in self.positions[index]]
+        return self.records[self.positions[index]]
+
+
+class CatalogCache:
+    # Parsed CSV records kept in memory per path. An entry is re-parsed only when
+    # the file's mtime or size changes; least recently used paths are evicted
+    # once more than max_entries files are cached. Returned lists (or mapped
+    # snapshot records) are shared between requests, so callers must treat
+    # them as read-only.
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # path -> (signature, records)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path):
+        sig = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == sig:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        records = load_records(path)
+        with self._lock:
+            self._entries[path] = (sig, records)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return records
+
+    def version(self, path):
+        # data version of a path as seen by the cache (changes whenever it re-parses)
+        return file_signature(path)
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'rows': sum(len(records) for _, records in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+catalog_cache = CatalogCache(max_entries=int(os.getenv('CATALOG_CACHE_SIZE', '32')))
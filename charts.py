@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from io import BytesIO
+
+from catalog_cache import file_signature
+from metrics import timed
+
+# Charts are rendered once per data version (the mtime/size of their source
+# CSVs) and the PNG bytes are kept in a small LRU cache. Pages only link to
+# /charts/<name>.png, which serves the cached bytes with ETag/Last-Modified.
+
+Chart = namedtuple('Chart', 'png etag last_modified')
+
+
+def _pyplot():
+    # matplotlib is only imported when a chart is actually rendered
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def figure_png(fig):
+    plt = _pyplot()
+    buf = BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format='png')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+# --- chart renderers: source path(s) in, PNG bytes (or None when there is no data) out ---
+def tuition_by_country(institutions_csv):
+    # avg tuition by country top 5
+    import pandas as pd
+    plt = _pyplot()
+    df = pd.read_csv(institutions_csv)
+    if df.empty:
+        return None
+    agg = df.groupby('country')['tuition_usd'].mean().nlargest(5)
+    fig, ax = plt.subplots(figsize=(6,3))
+    ax.bar(agg.index, agg.values)
+    ax.set_title('Top 5 Countries by Avg Tuition (USD)')
+    ax.tick_params(axis='x', labelrotation=30)
+    return figure_png(fig)
+
+
+def daily_registrations(series):
+    # series: [(date, count)] from the materialized site stats
+    if not series:
+        return None
+    plt = _pyplot()
+    days, counts = zip(*series)
+    fig, ax = plt.subplots(figsize=(6,3))
+    ax.plot(days, counts, marker='o')
+    ax.set_title('Daily Registrations')
+    ax.tick_params(axis='x', labelrotation=30)
+    return figure_png(fig)
+
+
+class ChartCache:
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._charts = {}  # name -> (render, sources)
+        self._rendered = OrderedDict()  # (name, data version) -> Chart or None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def register(self, name, render, *sources):
+        self._charts[name] = (render, sources)
+
+    def __contains__(self, name):
+        return name in self._charts
+
+    def version(self, name):
+        _, sources = self._charts[name]
+        return tuple(file_signature(p) for p in sources)
+
+    def get(self, name):
+        # cached Chart for the current data version, rendering it on first use
+        render, sources = self._charts[name]
+        key = (name, self.version(name))
+        with self._lock:
+            if key in self._rendered:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return self._rendered[key]
+        try:
+            with timed('chart_render'):
+                png = render(*sources)
+        except Exception:
+            png = None
+        chart = None
+        if png:
+            mtimes = [sig[0] for sig in key[1] if sig]
+            last_modified = max(mtimes) / 1e9 if mtimes else None
+            chart = Chart(png, hashlib.sha1(png).hexdigest(), last_modified)
+        with self._lock:
+            self.renders += 1
+            # drop older versions of the same chart straight away
+            for old in [k for k in self._rendered if k[0] == name]:
+                del self._rendered[old]
+            self._rendered[key] = chart
+            while len(self._rendered) > self.max_entries:
+                self._rendered.popitem(last=False)
+        return chart
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._rendered), 'hits': self.hits, 'renders': self.renders}
+
+
+chart_cache = ChartCache(max_entries=int(os.getenv('CHART_CACHE_SIZE', '16')))
@@ -0,0 +1,230 @@
+import bisect
+import calendar
+import functools
+import heapq
+import re
+import threading
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from catalog_cache import RecordView, catalog_cache, column_values, file_signature
+
+# Deadline-aware view of catalogs with a free-text Deadline column.
+#
+# Deadline strings are parsed once per CSV version into one of
+#   date    a fixed deadline ("2026-03-15", "15 March 2026", "March 2026")
+#   yearly  a recurring window of months ("June yearly", "Annual (April–June)")
+#   always  open-ended ("Ongoing", "Year-round", "Monthly events")
+# anything else ("Varies") is kept in listings but never matches a date query.
+# Dated items sit in a list sorted by the end of their next occurrence, so
+# "closing within N days" and date ranges are two bisections. A catalog's
+# items are sorted once and merged in. When the day moves on, the expired
+# prefix is cut off: fixed deadlines are dropped and recurring ones are
+# merged back at next year's occurrence -- no reparse.
+# Catalogs without a deadline column (scholarships) only list their rows.
+
+Deadline = namedtuple('Deadline', 'kind start end')  # dates for 'date', month numbers for 'yearly'
+DeadlineItem = namedtuple('DeadlineItem', 'catalog record start end')
+
+DEADLINE_FIELDS = ('deadline', 'closes', 'due')
+ALWAYS_WORDS = ('ongoing', 'year-round', 'year round', 'rolling', 'monthly', 'throughout', 'anytime')
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+MONTHS['sept'] = 9
+
+_month_re = re.compile(r'\b(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\b', re.I)
+_year_re = re.compile(r'\b(19|20)\d{2}\b')
+_date_formats = ('%Y-%m-%d', '%d %B %Y', '%d %b %Y', '%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%d/%m/%Y', '%d-%m-%Y')
+
+
+def month_end(year, month):
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse(text):
+    lowered = text.lower()
+    for fmt in _date_formats if any(c.isdigit() for c in text) else ():
+        try:
+            day = datetime.strptime(text, fmt).date()
+            return Deadline('date', None, day)
+        except ValueError:
+            pass
+    months = [MONTHS[m.lower()] for m in _month_re.findall(text)]
+    years = [int(m.group(0)) for m in _year_re.finditer(text)]
+    if months and years:
+        # "December 2025 - January 2026" ends in the last year given; a single
+        # year on a range that wraps ("December - January 2026") is the end's
+        first, last = years[0], years[-1]
+        if len(years) == 1 and months[-1] < months[0]:
+            first -= 1
+        return Deadline('date', date(first, months[0], 1), month_end(last, months[-1]))
+    if months:
+        return Deadline('yearly', months[0], months[-1])
+    if any(word in lowered for word in ALWAYS_WORDS):
+        return Deadline('always', None, None)
+    return None
+
+
+def parse_deadline(text):
+    text = ' '.join(str(text or '').split())
+    return _parse(text) if text else None
+
+
+def occurrence(deadline, today):
+    # (start, end) of the current or next occurrence; None once a fixed deadline passed
+    if deadline.kind == 'date':
+        return (deadline.start, deadline.end) if deadline.end >= today else None
+    first, last = deadline.start, deadline.end
+    for year in (today.year - 1, today.year, today.year + 1):
+        start = date(year, first, 1)
+        end = month_end(year + (1 if last < first else 0), last)
+        if end >= today:
+            return start, end
+    return None
+
+
+def deadline_field(records):
+    if not records:
+        return None
+    for key in records[0]:
+        if str(key).lower() in DEADLINE_FIELDS:
+            return key
+    return None
+
+
+class DeadlineIndex:
+
+    def __init__(self, catalogs, today=date.today):
+        # catalogs: name -> csv path; today: callable, injectable for tests
+        self.catalogs = dict(catalogs)
+        self.today = today
+        self._lock = threading.Lock()
+        self._sigs = {}
+        self._ends = []  # ordinal of each dated item's end, sorted
+        self._items = []  # [(catalog, position, deadline, start, end)], same order
+        self._always = []  # [(catalog, position)]
+        self._records = {}  # catalog -> records of the indexed version
+        self._expired = {}  # catalog -> positions of passed fixed deadlines
+        self._listings = {}  # catalog -> RecordView of the rows not expired
+        self._day = None
+
+    def _place(self, entries, catalog, position, deadline, day):
+        # append (end ordinal, item) for the occurrence on or after day, or mark it expired
+        occ = occurrence(deadline, day)
+        if occ is None:
+            self._expired[catalog].add(position)
+            self._listings.pop(catalog, None)
+        else:
+            entries.append((occ[1].toordinal(), (catalog, position, deadline) + occ))
+
+    def _merge(self, entries):
+        # merge new (end ordinal, item) entries into the sorted lists in one pass
+        entries.sort(key=lambda e: e[0])
+        merged = list(heapq.merge(zip(self._ends, self._items), entries, key=lambda e: e[0]))
+        self._ends = [e[0] for e in merged]
+        self._items = [e[1] for e in merged]
+
+    def _index(self, name, day):
+        keep = [i for i, item in enumerate(self._items) if item[0] != name]
+        self._ends = [self._ends[i] for i in keep]
+        self._items = [self._items[i] for i in keep]
+        self._always = [a for a in self._always if a[0] != name]
+        records = catalog_cache.get(self.catalogs[name])
+        self._records[name] = records
+        self._expired[name] = set()
+        self._listings.pop(name, None)
+        field = deadline_field(records)
+        if field is None:
+            return
+        entries = []
+        for position, value in enumerate(column_values(records, field)):
+            deadline = parse_deadline(value)
+            if deadline is None:
+                continue
+            if deadline.kind == 'always':
+                self._always.append((name, position))
+            else:
+                self._place(entries, name, position, deadline, day)
+        self._merge(entries)
+
+    def _advance(self, day):
+        # drop everything that ended before day; recurring items move to their next occurrence
+        cut = bisect.bisect_left(self._ends, day.toordinal())
+        if not cut:
+            return
+        expired = self._items[:cut]
+        del self._ends[:cut], self._items[:cut]
+        entries = []
+        for catalog, position, deadline, _, _ in expired:
+            self._place(entries, catalog, position, deadline, day)
+        self._merge(entries)
+
+    def refresh(self, day=None):
+        day = day or self.today()
+        with self._lock:
+            for name, path in self.catalogs.items():
+                sig = file_signature(path)
+                if self._sigs.get(name, ()) != sig:
+                    self._index(name, self._day or day)
+                    self._sigs[name] = sig
+            if self._day is None or day > self._day:
+                self._advance(day)
+                self._day = day
+        return day
+
+    def _item(self, entry):
+        catalog, position, _, start, end = entry
+        return DeadlineItem(catalog, self._records[catalog][position], start, end)
+
+    def _dated(self, first, last, catalog=None):
+        lo = bisect.bisect_left(self._ends, first.toordinal())
+        hi = bisect.bisect_right(self._ends, last.toordinal())
+        return [e for e in self._items[lo:hi] if catalog is None or e[0] == catalog]
+
+    def open_now(self, catalog=None, day=None):
+        # open today (by end date), then the open-ended ones
+        day = self.refresh(day)
+        with self._lock:
+            lo = bisect.bisect_left(self._ends, day.toordinal())
+            dated = [self._item(e) for e in self._items[lo:]
+                     if (catalog is None or e[0] == catalog) and (e[3] is None or e[3] <= day)]
+            always = [DeadlineItem(c, self._records[c][p], None, None) for c, p in self._always
+                      if catalog is None or c == catalog]
+        return dated + always
+
+    def closing_within(self, days, catalog=None, day=None):
+        day = self.refresh(day)
+        with self._lock:
+            return [self._item(e) for e in self._dated(day, day + timedelta(days=days), catalog)]
+
+    def between(self, first, last, catalog=None, day=None):
+        # items whose (next) deadline falls in [first, last]
+        day = self.refresh(day)
+        with self._lock:
+            return [self._item(e) for e in self._dated(max(first, day), last, catalog)]
+
+    def listing(self, catalog, day=None):
+        # every row of a catalog in file order, minus passed fixed deadlines
+        self.refresh(day)
+        with self._lock:
+            records, expired = self._records.get(catalog, []), self._expired.get(catalog, set())
+            if not expired:
+                return records
+            view = self._listings.get(catalog)
+            if view is None:
+                view = self._listings[catalog] = RecordView(
+                    records, [i for i in range(len(records)) if i not in expired])
+            return view
+
+    def counts(self, day=None):
+        day = self.refresh(day)
+        with self._lock:
+            today = day.toordinal()
+            lo = bisect.bisect_left(self._ends, today)
+            return {
+                'open': sum(1 for e in self._items[lo:] if e[3] is None or e[3] <= day) + len(self._always),
+                'closing_7': bisect.bisect_right(self._ends, today + 7) - lo,
+                'closing_30': bisect.bisect_right(self._ends, today + 30) - lo,
+                'dated': len(self._items),
+            }
@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug import security
+
+# Password hashing off the request thread. pbkdf2 runs in a small process
+# pool; at most HASH_MAX_PENDING hashes may be queued or running at once and
+# anything beyond that fails fast with HashingBusy (the routes turn it into
+# a 503), so a login storm can't tie up every worker thread.
+#
+#   PASSWORD_HASH_METHOD  werkzeug method string for new hashes
+#   PASSWORD_SALT_LENGTH  salt length for new hashes
+#   HASH_POOL_WORKERS     processes in the pool (0 = hash inline, for dev)
+#   HASH_MAX_PENDING      queued + running hashes before rejecting
+#   HASH_TIMEOUT          seconds to wait for a result before giving up
+
+HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:260000')
+SALT_LENGTH = int(os.getenv('PASSWORD_SALT_LENGTH', '16'))
+POOL_WORKERS = int(os.getenv('HASH_POOL_WORKERS', str(min(4, os.cpu_count() or 1))))
+MAX_PENDING = int(os.getenv('HASH_MAX_PENDING', str(max(POOL_WORKERS, 1) * 4)))
+TIMEOUT = float(os.getenv('HASH_TIMEOUT', '10'))
+
+
+class HashingBusy(Exception):
+    pass
+
+
+def _generate(password, method, salt_length):
+    return security.generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _check(pw_hash, password):
+    return security.check_password_hash(pw_hash, password)
+
+
+class HashingPool:
+
+    def __init__(self, workers=POOL_WORKERS, max_pending=MAX_PENDING, timeout=TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is not safe
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy()
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException as e:
+            self._slots.release()
+            if isinstance(e, BrokenProcessPool):
+                self._reset()
+                raise HashingBusy()
+            raise
+        # the slot is held until the hash really finishes: a timed-out hash
+        # that is already running can't be cancelled and keeps its worker busy
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise HashingBusy()
+        except BrokenProcessPool:
+            # a worker died; start a fresh pool on the next call
+            self._reset()
+            raise HashingBusy()
+
+    def _reset(self):
+        with self._lock:
+            self._executor = None
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+pool = HashingPool()
+
+
+def hash_password(password):
+    return pool.run(_generate, password, HASH_METHOD, SALT_LENGTH)
+
+
+def verify_password(pw_hash, password):
+    if not pw_hash:
+        return False
+    return pool.run(_check, pw_hash, password)
+
+
+def needs_rehash(pw_hash):
+    # True when a stored hash was made with other parameters than HASH_METHOD
+    # and SALT_LENGTH (werkzeug hashes are method$salt$hash)
+    if not pw_hash:
+        return False
+    method, _, rest = pw_hash.partition('$')
+    salt = rest.partition('$')[0]
+    return method != HASH_METHOD or len(salt) != SALT_LENGTH
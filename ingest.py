@@ -0,0 +1,347 @@
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from catalog_cache import file_signature
+from row_writer import SchemaError, file_lock, schema_for
+from metrics import timed
+
+# Bulk upsert of a CSV/JSONL feed into a catalog CSV in bounded memory.
+#
+#   1. the feed is streamed once: rows are validated against the catalog
+#      schema (spelled the way the CSV's own header spells it), written to a JSONL staging file and reduced to a 64-bit key
+#      hash (normalized link, or the whole row for catalogs without one)
+#      plus the row's offset in the staging file
+#   2. feed duplicates are dropped (last row wins) and the hashes are looked
+#      up in the catalog's persistent key set (<file>.keys.npz, rebuilt by
+#      streaming the CSV when its signature is stale) to split updates from
+#      inserts
+#   3. the catalog is rewritten to a temp file -- updated rows replaced in
+#      place, new rows appended -- and renamed over the original while
+#      holding the row_writer lock, so readers and appenders never see a
+#      partial file
+# Memory is O(feed rows x ~24 bytes) for the hash/offset arrays; row contents
+# are only ever held one chunk at a time.
+
+KEY_COLUMNS = ('link', 'website')
+EMPTY_KEY = 0
+
+
+def normalize_link(link):
+    link = (link or '').strip()
+    if not link:
+        return ''
+    parts = urlsplit(link if '//' in link else '//' + link)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/')
+    return host + path + ('?' + parts.query if parts.query else '')
+
+
+def key_column(headers):
+    lowered = [h.lower() for h in headers]
+    for name in KEY_COLUMNS:
+        if name in lowered:
+            return headers[lowered.index(name)]
+    return None
+
+
+def row_key(row, headers, key_col):
+    if key_col is not None:
+        return normalize_link(row.get(key_col))
+    return '\x1f'.join(' '.join(str(row.get(h, '')).split()).casefold() for h in headers if h != 'id')
+
+
+def key_hash(key):
+    if not key:
+        return EMPTY_KEY
+    value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def iter_feed(feed, fmt):
+    # yields (line_no, dict) from a CSV or JSONL feed without reading it whole
+    with open(feed, newline='', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        obj = json.loads(line)
+                    except ValueError as e:
+                        yield n, e
+                        continue
+                    yield n, obj if isinstance(obj, dict) else ValueError('not a JSON object')
+        else:
+            for n, row in enumerate(csv.DictReader(f), 2):
+                yield n, row
+
+
+def feed_format(feed, fmt=None):
+    if fmt:
+        return fmt
+    return 'jsonl' if os.path.splitext(feed)[1].lower() in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def validate(obj, headers):
+    # feed row -> schema row (columns matched case-insensitively); raises SchemaError
+    if isinstance(obj, Exception):
+        raise SchemaError(f'unparseable row: {obj}')
+    by_name = {h.lower(): h for h in headers}
+    row = {}
+    for name, value in obj.items():
+        if name is None:
+            raise SchemaError('more values than columns')
+        col = by_name.get(str(name).strip().lower())
+        if col is None:
+            raise SchemaError(f'unknown column {name!r}')
+        row[col] = '' if value is None else str(value).strip()
+    if not any(v for k, v in row.items() if k != 'id'):
+        raise SchemaError('empty row')
+    return {h: row.get(h, '') for h in headers}
+
+
+def _read_rows(path):
+    # (headers, iterator of row dicts) of an existing catalog CSV
+    f = open(path, newline='', encoding='utf-8')
+    reader = csv.reader(f)
+    headers = next(reader, [])
+
+    def rows():
+        with f:
+            for values in reader:
+                if any(v.strip() for v in values):
+                    yield dict(zip(headers, values))
+    return headers, rows()
+
+
+def catalog_headers(path, schema):
+    # the catalog file's own header when it matches the schema case-insensitively
+    # (shipped CSVs spell some columns differently), else the schema for a new file
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            headers = next(csv.reader(f), [])
+    except FileNotFoundError:
+        headers = []
+    if not headers:
+        return list(schema)
+    if [h.strip().lower() for h in headers] != [h.lower() for h in schema]:
+        raise SchemaError(f'{os.path.basename(path)} header {headers} does not match schema {schema}')
+    return headers
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class KeySet:
+    # Persistent set of key hashes of a catalog CSV, stored sorted in
+    # <file>.keys.npz together with the CSV signature it describes.
+
+    def __init__(self, path):
+        self.path = path
+        self.store = path + '.keys.npz'
+
+    def load(self, headers, key_col, chunk_rows=50000):
+        import numpy as np
+        sig = list(file_signature(self.path) or ())
+        try:
+            with np.load(self.store) as data:
+                if list(data['sig']) == sig:
+                    return data['keys']
+        except (OSError, KeyError, ValueError):
+            pass
+        parts = []
+        if sig:
+            _, rows = _read_rows(self.path)
+            for chunk in _chunks(rows, chunk_rows):
+                parts.append(np.fromiter((key_hash(row_key(r, headers, key_col)) for r in chunk),
+                                         dtype='uint64', count=len(chunk)))
+        keys = np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype='uint64')
+        self.save(keys)
+        return keys
+
+    def save(self, keys):
+        import numpy as np
+        tmp = self.store + '.tmp.npz'
+        np.savez(tmp, sig=np.array(file_signature(self.path) or (), dtype='int64'), keys=keys)
+        os.replace(tmp, self.store)
+
+
+class Ingest:
+
+    def __init__(self, path, chunk_rows=50000, progress=None, progress_every=100000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.progress = progress
+        self.progress_every = progress_every
+        schema = schema_for(path)
+        if not schema:
+            raise SchemaError(f'no schema registered for {os.path.basename(path)}')
+        self.headers = catalog_headers(path, schema)
+        self.key_col = key_column(self.headers)
+        self.stats = {'read': 0, 'rejected': 0, 'duplicates': 0, 'inserted': 0, 'updated': 0,
+                      'bytes': 0, 'seconds': 0.0}
+        self.errors = []  # first few (line, message)
+
+    def _report(self, stage):
+        if self.progress is None:
+            return
+        elapsed = time.perf_counter() - self._start
+        s = self.stats
+        rate = s['read'] / elapsed if elapsed else 0.0
+        self.progress(f"[{stage}] read {s['read']:,} rejected {s['rejected']:,} "
+                      f"inserted {s['inserted']:,} updated {s['updated']:,} ({rate:,.0f} rows/s)")
+
+    def _stage(self, feed, fmt, staging):
+        # pass 1: validate and stage the feed; returns (hashes, offsets)
+        import numpy as np
+        hashes, offsets = [], []
+        chunk_h, chunk_o = [], []
+        offset = 0
+        for line_no, obj in iter_feed(feed, fmt):
+            self.stats['read'] += 1
+            try:
+                row = validate(obj, self.headers)
+                h = key_hash(row_key(row, self.headers, self.key_col))
+                if h == EMPTY_KEY:
+                    raise SchemaError(f'missing {self.key_col}')
+            except SchemaError as e:
+                self.stats['rejected'] += 1
+                if len(self.errors) < 10:
+                    self.errors.append((line_no, str(e)))
+                continue
+            data = (json.dumps([row[h_] for h_ in self.headers], ensure_ascii=False) + '\n').encode('utf-8')
+            staging.write(data)
+            chunk_h.append(h)
+            chunk_o.append(offset)
+            offset += len(data)
+            if len(chunk_h) >= self.chunk_rows:
+                hashes.append(np.array(chunk_h, dtype='uint64'))
+                offsets.append(np.array(chunk_o, dtype='int64'))
+                chunk_h, chunk_o = [], []
+            if self.progress_every and self.stats['read'] % self.progress_every == 0:
+                self._report('read')
+        hashes.append(np.array(chunk_h, dtype='uint64'))
+        offsets.append(np.array(chunk_o, dtype='int64'))
+        self.stats['bytes'] = os.path.getsize(feed)
+        return np.concatenate(hashes), np.concatenate(offsets)
+
+    def run(self, feed, fmt=None):
+        import numpy as np
+        fmt = feed_format(feed, fmt)
+        self._start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.TemporaryFile(dir=directory) as staging:
+            hashes, offsets = self._stage(feed, fmt, staging)
+            # last occurrence of each key in the feed wins
+            rev_unique, rev_index = np.unique(hashes[::-1], return_index=True)
+            winners = len(hashes) - 1 - rev_index
+            self.stats['duplicates'] = len(hashes) - len(winners)
+            with timed('csv_write'), file_lock(self.path):
+                keyset = KeySet(self.path)
+                existing = keyset.load(self.headers, self.key_col, self.chunk_rows)
+                is_update = np.isin(rev_unique, existing, assume_unique=True)
+                # rev_unique is sorted, so updates can be looked up with searchsorted
+                update_keys = rev_unique[is_update]
+                update_rows = winners[is_update]
+                insert_rows = np.sort(winners[~is_update])
+                keys = self._rewrite(staging, hashes, offsets, update_keys, update_rows, insert_rows)
+                keyset.save(keys)
+        self.stats['seconds'] = time.perf_counter() - self._start
+        self._report('done')
+        return self.stats
+
+    def _staged(self, staging, offset):
+        staging.seek(int(offset))
+        return dict(zip(self.headers, json.loads(staging.readline())))
+
+    def _rewrite(self, staging, hashes, offsets, update_keys, update_rows, insert_rows):
+        # pass 2: stream the catalog into a temp file with updates applied and
+        # inserts appended, then rename it over the catalog; returns the new key set
+        import numpy as np
+        id_field = 'id' if 'id' in self.headers else None
+        written = np.zeros(len(update_keys), dtype=bool)
+        max_id = 0
+        key_parts = []
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            headers, rows = _read_rows(self.path)
+            if [h.strip().lower() for h in headers] != [h.lower() for h in self.headers]:
+                raise SchemaError(f'{os.path.basename(self.path)} header {headers} does not match schema {self.headers}')
+        else:
+            rows = iter(())
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.ingest.tmp')
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as out:
+                writer = csv.DictWriter(out, fieldnames=self.headers, lineterminator='\n')
+                writer.writeheader()
+                for chunk in _chunks(rows, self.chunk_rows):
+                    hs = np.fromiter((key_hash(row_key(r, self.headers, self.key_col)) for r in chunk),
+                                     dtype='uint64', count=len(chunk))
+                    pos = np.minimum(np.searchsorted(update_keys, hs), max(len(update_keys) - 1, 0))
+                    hit = (update_keys[pos] == hs) if len(update_keys) else np.zeros(len(chunk), dtype=bool)
+                    kept = np.ones(len(chunk), dtype=bool)
+                    for i, row in enumerate(chunk):
+                        if id_field:
+                            max_id = max(max_id, _int(row.get(id_field)))
+                        if not hit[i]:
+                            writer.writerow(row)
+                            continue
+                        p = pos[i]
+                        if written[p]:
+                            kept[i] = False  # older duplicate of an updated key
+                            continue
+                        new = self._staged(staging, offsets[update_rows[p]])
+                        if id_field:
+                            new[id_field] = row.get(id_field) or new[id_field]
+                        writer.writerow(new)
+                        written[p] = True
+                        self.stats['updated'] += 1
+                    key_parts.append(hs[kept])
+                    self._report('merge')
+                for start in range(0, len(insert_rows), self.chunk_rows):
+                    for idx in insert_rows[start:start + self.chunk_rows]:
+                        new = self._staged(staging, offsets[idx])
+                        if id_field and not _int(new[id_field]):
+                            max_id += 1
+                            new[id_field] = max_id
+                        writer.writerow(new)
+                    self.stats['inserted'] += len(insert_rows[start:start + self.chunk_rows])
+                    self._report('insert')
+                # update keys absent from the CSV (stale key set) were appended nowhere
+                for p in np.flatnonzero(~written):
+                    writer.writerow(self._staged(staging, offsets[update_rows[p]]))
+                    self.stats['inserted'] += 1
+                out.flush()
+                os.fsync(out.fileno())
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, tmp)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return np.unique(np.concatenate(key_parts + [update_keys, hashes[insert_rows]]))
+
+
+def _int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
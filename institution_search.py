@@ -0,0 +1,158 @@
+import re
+import threading
+
+from catalog_cache import RecordView, catalog_cache, column_values, file_signature
+
+# In-memory search structure for institutions.csv, rebuilt when the file
+# changes. It is built from the columns of the cached catalog records and
+# holds positions only; rows are fetched for the results actually shown.
+# Positions are pre-ordered by ranking, so any set of matching positions is
+# already in result order.
+#   q        trigram inverted index over lowercased program/institution text,
+#            candidates verified with a plain substring test (same matches as
+#            the old `q in str(...).lower()` filter)
+#   country  categorical codes; the pattern is tested once per distinct value
+#   level    same as country
+#   budget   tuition sorted once, `<= budget` is a searchsorted cut
+# numpy is imported inside the methods so importing the app stays cheap.
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class InstitutionIndex:
+
+    def __init__(self, records):
+        # records: catalog records (a parsed list or mapped snapshot); columns
+        # are read with column_values, rows are only fetched for results
+        import numpy as np
+        n = len(records)
+        self.size = n
+        self._records = records
+
+        def column(col):
+            return column_values(records, col) if n else []
+
+        ranking = np.array([_number(v) for v in column('ranking')], dtype=float)
+        self.order = np.argsort(ranking, kind='mergesort')  # NaN (no ranking) last
+        self.records = RecordView(records, self.order)
+        self.by_id = {}
+        ids = column('id')
+        for pos, row in enumerate(self.order.tolist()):
+            self.by_id.setdefault(ids[row] if ids[row] != '' else None, pos)
+
+        def text(col):
+            values = column(col)
+            return [str(values[row]).lower() for row in self.order.tolist()]
+
+        self.program = text('program')
+        self.institution = text('institution')
+        postings = {}
+        for pos in range(n):
+            for gram in _trigrams(self.program[pos]) | _trigrams(self.institution[pos]):
+                postings.setdefault(gram, []).append(pos)
+        self.trigrams = {g: np.asarray(p, dtype=np.int64) for g, p in postings.items()}
+
+        self.categories = {}
+        for col in ('country', 'level'):
+            values = column(col)
+            uniques, codes = np.unique(np.array([str(values[row]) for row in self.order.tolist()], dtype=object),
+                                       return_inverse=True) if n else ([], np.zeros(0, dtype=np.int64))
+            self.categories[col] = (codes, list(uniques))
+
+        tuition = np.array([_number(v) for v in column('tuition_usd')], dtype=float)[self.order] \
+            if n else np.zeros(0)
+        self.tuition_order = np.argsort(tuition, kind='mergesort')
+        self.tuition_sorted = tuition[self.tuition_order]
+
+    def _match_q(self, q):
+        import numpy as np
+        q = q.lower()
+        grams = _trigrams(q)
+        if grams:
+            lists = sorted((self.trigrams.get(g) for g in grams), key=lambda a: -1 if a is None else len(a))
+            if lists[0] is None:
+                return np.zeros(0, dtype=np.int64)
+            candidates = lists[0]
+            for arr in lists[1:]:
+                candidates = np.intersect1d(candidates, arr, assume_unique=True)
+                if not len(candidates):
+                    break
+        else:
+            candidates = range(self.size)
+        return np.fromiter((i for i in candidates if q in self.program[i] or q in self.institution[i]),
+                           dtype=np.int64)
+
+    def _match_category(self, col, pattern):
+        # same semantics as Series.str.contains(pattern, case=False, na=False)
+        import numpy as np
+        codes, uniques = self.categories[col]
+        try:
+            rx = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            rx = re.compile(re.escape(pattern), re.IGNORECASE)
+        hits = [code for code, value in enumerate(uniques) if value and rx.search(value)]
+        return np.isin(codes, hits)
+
+    def search(self, q='', country='', level='', budget=None):
+        import numpy as np
+        if not self.size:
+            return []
+        mask = None
+
+        def narrow(m):
+            nonlocal mask
+            mask = m if mask is None else mask & m
+
+        if q:
+            m = np.zeros(self.size, dtype=bool)
+            m[self._match_q(q)] = True
+            narrow(m)
+        if country:
+            narrow(self._match_category('country', country))
+        if level:
+            narrow(self._match_category('level', level))
+        if budget is not None:
+            m = np.zeros(self.size, dtype=bool)
+            if budget == budget:  # NaN budget matches nothing
+                m[self.tuition_order[:np.searchsorted(self.tuition_sorted, budget, side='right')]] = True
+            narrow(m)
+        if mask is None:
+            return self.records
+        return RecordView(self._records, self.order[np.flatnonzero(mask)])
+
+    def get(self, inst_id):
+        pos = self.by_id.get(inst_id)
+        return self.records[pos] if pos is not None else None
+
+
+class InstitutionSearch:
+    # InstitutionIndex for a CSV path, rebuilt when its mtime/size changes
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sig = None
+        self._index = None
+
+    def index(self):
+        sig = file_signature(self.path)
+        with self._lock:
+            if self._index is None or sig != self._sig:
+                self._index = InstitutionIndex(catalog_cache.get(self.path))
+                self._sig = sig
+            return self._index
+
+    def search(self, q='', country='', level='', budget=None):
+        return self.index().search(q, country, level, budget)
+
+    def get(self, inst_id):
+        return self.index().get(inst_id)
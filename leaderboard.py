@@ -0,0 +1,149 @@
+import bisect
+import threading
+
+# Points ranking kept in memory and updated incrementally.
+#   _fenwick  counts of users per points value (binary indexed tree), so
+#             "how many users have more points than p" is O(log P)
+#   _buckets  points -> {email: None}, insertion ordered: among equal scores
+#             whoever reached the score first is listed first
+#   _values   sorted distinct point values, walked from the top for top-N
+# Ranks are competition ranks (ties share a rank).
+
+
+class Leaderboard:
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._points = {}
+        self._buckets = {}
+        self._values = []
+        self._tree = [0] * 1025  # 1-based, covers points 0..1023; grows by doubling
+
+    # --- fenwick tree over points values ---
+    def _grow(self, points):
+        size = len(self._tree) - 1
+        if points < size:
+            return
+        while size <= points:
+            size *= 2
+        counts = [len(self._buckets.get(v, ())) for v in range(size)]
+        tree = [0] * (size + 1)
+        for i, c in enumerate(counts, 1):
+            tree[i] += c
+            j = i + (i & -i)
+            if j <= size:
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _add(self, points, delta):
+        i = points + 1
+        size = len(self._tree) - 1
+        while i <= size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_upto(self, points):
+        # users with points <= points
+        i = min(points + 1, len(self._tree) - 1)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    # --- updates ---
+    def update(self, email, points):
+        points = max(int(points or 0), 0)
+        with self._lock:
+            old = self._points.get(email)
+            if old == points:
+                return
+            if old is not None:
+                self._remove(email, old)
+            self._grow(points)
+            bucket = self._buckets.get(points)
+            if bucket is None:
+                bucket = self._buckets[points] = {}
+                bisect.insort(self._values, points)
+            bucket[email] = None
+            self._points[email] = points
+            self._add(points, 1)
+
+    def _remove(self, email, points):
+        bucket = self._buckets[points]
+        del bucket[email]
+        if not bucket:
+            del self._buckets[points]
+            del self._values[bisect.bisect_left(self._values, points)]
+        del self._points[email]
+        self._add(points, -1)
+
+    def remove(self, email):
+        with self._lock:
+            old = self._points.get(email)
+            if old is not None:
+                self._remove(email, old)
+
+    # --- queries ---
+    def __len__(self):
+        return len(self._points)
+
+    def rank(self, email):
+        # (rank, points) or None for users not on the board
+        with self._lock:
+            points = self._points.get(email)
+            if points is None:
+                return None
+            return len(self._points) - self._count_upto(points) + 1, points
+
+    def top(self, n=10):
+        # [(rank, email, points)] best first
+        out = []
+        with self._lock:
+            above = 0
+            for points in reversed(self._values):
+                bucket = self._buckets[points]
+                for email in bucket:
+                    if len(out) >= n:
+                        return out
+                    out.append((above + 1, email, points))
+                above += len(bucket)
+        return out
+
+
+class LedgerLeaderboard(Leaderboard):
+    # Leaderboard fed from the achievements ledger. The first query loads every
+    # row; afterwards only rows whose rev moved (check-ins from any worker) are
+    # applied, so a sync costs O(changes * log P). Every account gets a ledger
+    # row at registration; only users with points are on the board.
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self._rev = None
+        self._sync_lock = threading.Lock()
+
+    def update(self, email, points):
+        if int(points or 0) > 0:
+            super().update(email, points)
+        else:
+            self.remove(email)
+
+    def sync(self):
+        with self._sync_lock:
+            if self._rev is None:
+                rows = self.store.all_points()
+                self._rev = 0
+            else:
+                rows = self.store.points_since(self._rev)
+            for email, points, rev in rows:
+                self.update(email, points)
+                self._rev = max(self._rev, rev)
+
+    def rank(self, email):
+        self.sync()
+        return super().rank(email)
+
+    def top(self, n=10):
+        self.sync()
+        return super().top(n)
@@ -0,0 +1,343 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import ssl
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+
+from catalog_cache import RecordView, catalog_cache, column_values, file_signature
+from search_index import LINK_FIELDS
+
+# Outbound link health checks.
+#
+# LinkChecker speaks just enough HTTP/1.1 over asyncio streams to check many
+# links at once: one pool of keep-alive connections per (scheme, host, port),
+# each capped at per_host concurrent requests, plus a global concurrency cap.
+# A link is tried with HEAD, falling back to GET when the server rejects HEAD;
+# redirects are followed. Timeouts, connection failures, 429 and 5xx are
+# retried with exponential backoff. Each link ends up in one of three states:
+#   ok       final status < 400
+#   broken   404/410, unknown host or refused connection after all retries
+#            (network failures count only if some other host did answer)
+#   unknown  anything inconclusive (timeouts, 401/403, 5xx, TLS errors)
+# Results are merged into a JSON status file that LinkStatus serves to the
+# listing routes.
+
+USER_AGENT = 'EduverseX-linkcheck/1.0'
+MAX_BODY = 64 * 1024  # GET bodies up to this size are drained to keep the connection
+BROKEN_STATUSES = (404, 410)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def link_field(record):
+    # first column (case-insensitive) holding a record's outbound link
+    lowered = {str(k).lower(): k for k in record}
+    for name in LINK_FIELDS:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+def interleave(urls):
+    # round-robin over hosts so one big host does not hold every global slot
+    by_host = {}
+    for url in dict.fromkeys(urls):
+        by_host.setdefault(urlsplit(url).hostname, []).append(url)
+    queues = list(by_host.values())
+    out = []
+    for i in range(max((len(q) for q in queues), default=0)):
+        out.extend(q[i] for q in queues if i < len(q))
+    return out
+
+
+class _Pool:
+    # keep-alive connections to one origin
+
+    def __init__(self, scheme, host, port, limit, timeout, ssl_context):
+        self.scheme, self.host, self.port = scheme, host, port
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.slots = asyncio.Semaphore(limit)
+        self.idle = []
+        self.opened = 0
+
+    async def _connect(self):
+        tls = self.ssl_context if self.scheme == 'https' else None
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=tls, server_hostname=self.host if tls else None),
+            self.timeout)
+        self.opened += 1
+        return conn
+
+    async def request(self, method, target):
+        # (status, headers) of one request; reuses an idle connection when possible
+        async with self.slots:
+            while self.idle:
+                conn = self.idle.pop()
+                if conn[0].at_eof() or conn[1].is_closing():
+                    conn[1].close()
+                    continue
+                try:
+                    return await self._send(conn, method, target)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    # the server dropped the idle connection; try a fresh one
+                    conn[1].close()
+            return await self._send(await self._connect(), method, target)
+
+    async def _send(self, conn, method, target):
+        reader, writer = conn
+        host = self.host if self.port in (80, 443) else f'{self.host}:{self.port}'
+        try:
+            writer.write(f'{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n'
+                         f'Accept: */*\r\nConnection: keep-alive\r\n\r\n'.encode('latin-1'))
+            await writer.drain()
+            status, headers, reusable = await asyncio.wait_for(self._response(reader, method), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if reusable:
+            self.idle.append(conn)
+        else:
+            writer.close()
+        return status, headers
+
+    async def _response(self, reader, method):
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        version, status = lines[0].split(' ', 2)[:2]
+        status = int(status)
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        reusable = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            return status, headers, reusable
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            drained = 0
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                drained += size
+                if drained > MAX_BODY:
+                    return status, headers, False
+                await reader.readexactly(size + 2)
+                if not size:
+                    return status, headers, reusable
+        length = headers.get('content-length')
+        if length is not None and length.isdigit() and int(length) <= MAX_BODY:
+            await reader.readexactly(int(length))
+            return status, headers, reusable
+        return status, headers, False
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class LinkChecker:
+
+    def __init__(self, concurrency=100, per_host=4, timeout=10.0, retries=2, backoff=0.5, max_redirects=5):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_redirects = max_redirects
+        self.ssl_context = ssl.create_default_context()
+        self._pools = {}
+        self.requests = 0
+
+    def connections(self):
+        return sum(pool.opened for pool in self._pools.values())
+
+    def _pool(self, parts):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool(parts.scheme, parts.hostname, port, self.per_host,
+                                            self.timeout, self.ssl_context)
+        return pool
+
+    async def _fetch(self, url, method):
+        # (status, final url, headers) following redirects
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            target = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+            self.requests += 1
+            status, headers = await self._pool(parts).request(method, target)
+            location = headers.get('location')
+            if status in (301, 302, 303, 307, 308) and location:
+                target_url = urljoin(url, location)
+                if urlsplit(target_url).scheme in ('http', 'https') and urlsplit(target_url).hostname:
+                    url = target_url
+                    continue
+            return status, url, headers
+        return status, url, headers
+
+    async def check(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return {'state': 'unknown', 'status': None, 'error': 'unsupported url'}
+        result = {}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff * 2 ** (attempt - 1)
+                retry_after = result.get('retry_after')
+                if retry_after:
+                    delay = max(delay, min(retry_after, 30))
+                await asyncio.sleep(delay * (1 + random.random() / 4))
+            try:
+                status, final, headers = await self._fetch(url, 'HEAD')
+                if status >= 400 and status not in RETRY_STATUSES:
+                    # plenty of servers reject or mishandle HEAD; ask again with GET
+                    status, final, headers = await self._fetch(url, 'GET')
+            except (socket.gaierror, ConnectionRefusedError) as e:
+                result = {'state': 'broken', 'status': None, 'error': type(e).__name__}
+                continue
+            except ssl.SSLError as e:
+                return {'state': 'unknown', 'status': None, 'error': f'ssl: {e.reason}'}
+            except (asyncio.TimeoutError, OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                    ValueError) as e:
+                result = {'state': 'unknown', 'status': None, 'error': type(e).__name__}
+                continue
+            if status < 400:
+                return {'state': 'ok', 'status': status, 'error': '', 'url': final}
+            if status in BROKEN_STATUSES:
+                return {'state': 'broken', 'status': status, 'error': ''}
+            result = {'state': 'unknown', 'status': status, 'error': ''}
+            if status not in RETRY_STATUSES:
+                return result
+            retry_after = headers.get('retry-after', '')
+            if retry_after.isdigit():
+                result['retry_after'] = int(retry_after)
+        result.pop('retry_after', None)
+        return result
+
+    async def run(self, urls, progress=None):
+        # {url: result}; progress(done, total) is called as links finish
+        gate = asyncio.Semaphore(self.concurrency)
+        results = {}
+        urls = interleave(urls)
+
+        async def one(url):
+            async with gate:
+                result = await self.check(url)
+            result['checked_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            results[url] = result
+            if progress is not None:
+                progress(len(results), len(urls))
+
+        try:
+            await asyncio.gather(*(one(url) for url in urls))
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+        if not any(r['status'] for r in results.values()):
+            # not a single server answered: more likely no network/DNS here than
+            # every site being gone, so don't let that hide anything
+            for r in results.values():
+                if r['state'] == 'broken':
+                    r['state'], r['error'] = 'unknown', r['error'] + ' (no host reachable)'
+        return results
+
+
+def check_links(urls, progress=None, **options):
+    checker = LinkChecker(**options)
+    start = time.perf_counter()
+    results = asyncio.run(checker.run(urls, progress))
+    return results, {'links': len(results), 'requests': checker.requests,
+                     'connections': checker.connections(), 'seconds': time.perf_counter() - start}
+
+
+class LinkStatus:
+    # The status file as seen by the web workers: reloaded when it changes on
+    # disk, merged and rewritten atomically by the checker.
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sig = None
+        self._results = {}
+        self._broken = frozenset()
+        self._hidden = {}  # csv path -> (catalog records, hidden positions, visible view), per status version
+
+    def _load(self):
+        sig = file_signature(self.path)
+        if sig == self._sig:
+            return
+        with self._lock:
+            if sig == self._sig:
+                return
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    results = json.load(f)
+            except (OSError, ValueError):
+                results = {}
+            self._results = results
+            self._broken = frozenset(url for url, r in results.items() if r.get('state') == 'broken')
+            self._hidden = {}
+            self._sig = sig
+
+    def state(self, url):
+        self._load()
+        return self._results.get(str(url or '').strip(), {}).get('state', '')
+
+    def _hidden_positions(self, path, catalog):
+        # (positions of broken links, view of the rest) for one version of a catalog
+        with self._lock:
+            entry = self._hidden.get(path)
+            if entry is not None and entry[0] is catalog:
+                return entry[1], entry[2]
+        field = link_field(catalog[0]) if len(catalog) else None
+        hidden = frozenset()
+        if field is not None:
+            hidden = frozenset(i for i, url in enumerate(column_values(catalog, field))
+                               if str(url or '').strip() in self._broken)
+        view = RecordView(catalog, [i for i in range(len(catalog)) if i not in hidden]) if hidden else catalog
+        with self._lock:
+            self._hidden[path] = (catalog, hidden, view)
+        return hidden, view
+
+    def visible(self, path, records):
+        # records of the catalog at path (all of them, a RecordView over them, or
+        # any list of its rows) without the ones whose link is known to be broken
+        self._load()
+        if not self._broken or not records:
+            return records
+        catalog = catalog_cache.get(path)
+        hidden, view = self._hidden_positions(path, catalog)
+        if not hidden:
+            return records
+        if records is catalog:
+            return view
+        if isinstance(records, RecordView) and records.records is catalog:
+            return RecordView(catalog, [i for i in records.positions if i not in hidden])
+        field = link_field(records[0])
+        if field is None:
+            return records
+        return [r for r in records if str(r.get(field) or '').strip() not in self._broken]
+
+    def merge(self, results):
+        self._load()
+        with self._lock:
+            merged = dict(self._results)
+        merged.update(results)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=0, sort_keys=True)
+        os.replace(tmp, self.path)
+        return merged
+
+    def stats(self):
+        self._load()
+        counts = {'ok': 0, 'broken': 0, 'unknown': 0}
+        for r in self._results.values():
+            counts[r.get('state', 'unknown')] = counts.get(r.get('state', 'unknown'), 0) + 1
+        return counts
@@ -0,0 +1,141 @@
+import cProfile
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+# Per-process request instrumentation, exported in Prometheus text format.
+#   - latency histogram per endpoint
+#   - count/seconds of hot-path operations (csv_read, csv_write, chart_render,
+#     template_render, password_hash) per endpoint, recorded through timed()
+#   - opt-in cProfile: with METRICS_PROFILING=1 a request sent with the
+#     X-Profile: 1 header is profiled and, if it took longer than
+#     PROFILE_SLOW_MS, its pstats are dumped to PROFILE_DIR
+# Every gunicorn worker keeps its own numbers; scrape each worker or sum them.
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROFILING = os.getenv('METRICS_PROFILING', '') == '1'
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '200'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+
+_lock = threading.Lock()
+_latency = {}  # endpoint -> [bucket counts..., +Inf count, sum]
+_ops = defaultdict(lambda: [0, 0.0])  # (endpoint, op) -> [count, seconds]
+_untracked_ops = defaultdict(lambda: [0, 0.0])  # ops outside a request (startup, CLI)
+_collectors = {}  # name -> callable returning {metric: value}
+
+
+@contextmanager
+def timed(op):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_op(op, time.perf_counter() - start)
+
+
+def record_op(op, seconds):
+    if has_request_context():
+        ops = g.setdefault('_metrics_ops', {})
+        entry = ops.setdefault(op, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+    else:
+        with _lock:
+            entry = _untracked_ops[op]
+            entry[0] += 1
+            entry[1] += seconds
+
+
+def register_collector(name, fn):
+    # fn() -> {metric: number}; exported as eduverse_<name>_<metric> gauges
+    _collectors[name] = fn
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    if PROFILING and request.headers.get('X-Profile') == '1':
+        g._metrics_profiler = cProfile.Profile()
+        g._metrics_profiler.enable()
+
+
+def _after_request(response):
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    endpoint = request.endpoint or 'unmatched'
+    profiler = g.pop('_metrics_profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        if elapsed * 1000 >= PROFILE_SLOW_MS:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f'{endpoint}-{int(time.time() * 1000)}.pstats')
+            profiler.dump_stats(path)
+            response.headers['X-Profile-Dump'] = os.path.basename(path)
+    ops = g.pop('_metrics_ops', {})
+    with _lock:
+        hist = _latency.get(endpoint)
+        if hist is None:
+            hist = _latency[endpoint] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                hist[i] += 1
+        hist[len(BUCKETS)] += 1
+        hist[len(BUCKETS) + 1] += elapsed
+        for op, (count, seconds) in ops.items():
+            entry = _ops[(endpoint, op)]
+            entry[0] += count
+            entry[1] += seconds
+    return response
+
+
+def init_app(app):
+    # register first so the latency covers the app's own before_request hooks
+    app.before_request_funcs.setdefault(None, []).insert(0, _before_request)
+    app.after_request(_after_request)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        lines.append('# HELP eduverse_request_duration_seconds Request latency per endpoint.')
+        lines.append('# TYPE eduverse_request_duration_seconds histogram')
+        for endpoint, hist in sorted(_latency.items()):
+            ep = _label(endpoint)
+            for i, bound in enumerate(BUCKETS):
+                lines.append(f'eduverse_request_duration_seconds_bucket{{endpoint="{ep}",le="{bound}"}} {hist[i]}')
+            lines.append(f'eduverse_request_duration_seconds_bucket{{endpoint="{ep}",le="+Inf"}} {hist[len(BUCKETS)]}')
+            lines.append(f'eduverse_request_duration_seconds_sum{{endpoint="{ep}"}} {hist[len(BUCKETS) + 1]:.6f}')
+            lines.append(f'eduverse_request_duration_seconds_count{{endpoint="{ep}"}} {hist[len(BUCKETS)]}')
+
+        ops = dict(_ops)
+        ops.update({('none', op): v for op, v in _untracked_ops.items()})
+        lines.append('# HELP eduverse_op_total Hot-path operations (csv_read, csv_write, chart_render, ...) per endpoint.')
+        lines.append('# TYPE eduverse_op_total counter')
+        for (endpoint, op), (count, _) in sorted(ops.items()):
+            lines.append(f'eduverse_op_total{{endpoint="{_label(endpoint)}",op="{_label(op)}"}} {count}')
+        lines.append('# HELP eduverse_op_seconds_total Time spent in hot-path operations per endpoint.')
+        lines.append('# TYPE eduverse_op_seconds_total counter')
+        for (endpoint, op), (_, seconds) in sorted(ops.items()):
+            lines.append(f'eduverse_op_seconds_total{{endpoint="{_label(endpoint)}",op="{_label(op)}"}} {seconds:.6f}')
+
+    for name, fn in sorted(_collectors.items()):
+        try:
+            values = fn()
+        except Exception:
+            continue
+        for metric, value in sorted(values.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                full = f'eduverse_{name}_{metric}'
+                lines.append(f'# TYPE {full} gauge')
+                lines.append(f'{full} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,141 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from flask import make_response, request, session
+
+from api_cache import normalize_args
+from catalog_cache import file_signature
+
+# Fully rendered HTML of anonymous GET pages.
+#
+# A page is keyed on its endpoint, view args, normalized query args and the
+# versions of the data it is rendered from (file signatures of its CSVs, or
+# callables for versions that aren't files, e.g. today's date). New data means
+# a new key, so nothing is ever invalidated explicitly; old keys age out of
+# the LRU. Requests carrying a session (logged in, pending flash messages)
+# bypass the cache, and a response is only stored if rendering it left the
+# session untouched. With a disk directory configured, pages are also written
+# there so every worker can serve what another one rendered.
+
+DISK_PRUNE_EVERY = 64
+
+
+class PageCache:
+
+    def __init__(self, max_entries=512, max_bytes=32 << 20, disk_dir=None, disk_entries=4096):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_entries = disk_entries
+        self._entries = OrderedDict()  # key -> body
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def key(self, versions):
+        raw = json.dumps([request.endpoint, sorted((request.view_args or {}).items()),
+                          [kv for kv in normalize_args(request.args) if kv[1] != ''], versions],
+                         separators=(',', ':'), default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _remember(self, key, body):
+        # caller holds the lock
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = body
+        self._bytes += len(body)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+        if self.disk_dir:
+            try:
+                with open(os.path.join(self.disk_dir, key + '.html'), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                body = None
+            if body is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, body)
+                return body
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, body):
+        with self._lock:
+            self._remember(key, body)
+            self._puts += 1
+            prune = self._puts % DISK_PRUNE_EVERY == 0
+        if self.disk_dir:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, os.path.join(self.disk_dir, key + '.html'))
+            if prune:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        # drop the least recently written pages beyond disk_entries
+        try:
+            files = [e for e in os.scandir(self.disk_dir) if e.name.endswith('.html')]
+        except OSError:
+            return
+        if len(files) <= self.disk_entries:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime_ns)
+        for entry in files[:len(files) - self.disk_entries]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def cached(self, *sources):
+        # route decorator; sources are file paths or zero-argument callables
+        def decorate(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method not in ('GET', 'HEAD') or session:
+                    with self._lock:
+                        self.bypassed += 1
+                    return view(*args, **kwargs)
+                key = self.key([s() if callable(s) else file_signature(s) for s in sources])
+                body = self.get(key)
+                if body is not None:
+                    resp = make_response(body)
+                    resp.headers['X-Page-Cache'] = 'hit'
+                    return resp
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code == 200 and resp.mimetype == 'text/html' and not session and not session.modified:
+                    self.put(key, resp.get_data())
+                resp.headers['X-Page-Cache'] = 'miss'
+                return resp
+            return wrapper
+        return decorate
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits,
+                    'disk_hits': self.disk_hits, 'misses': self.misses, 'bypassed': self.bypassed,
+                    'hit_ratio': ((self.hits + self.disk_hits) / lookups) if lookups else 0.0}
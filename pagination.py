@@ -0,0 +1,132 @@
+import base64
+import json
+import math
+
+from flask import request, url_for
+
+from catalog_cache import column_values
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+
+
+class Page:
+    # one page of an already-parsed record list; items is a slice, nothing else is copied
+
+    def __init__(self, records, offset, limit):
+        self.total = len(records)
+        self.offset = offset
+        self.limit = limit
+        self.items = records[offset:offset + limit]
+        self.page = offset // limit + 1
+        self.pages = max(1, math.ceil(self.total / limit))
+        self.has_prev = offset > 0
+        self.has_next = offset + limit < self.total
+
+    def to_dict(self):
+        return {'page': self.page, 'pages': self.pages, 'limit': self.limit, 'total': self.total}
+
+
+def clamp_limit(limit):
+    if not limit or limit < 1:
+        return DEFAULT_LIMIT
+    return min(limit, MAX_LIMIT)
+
+
+def paginate(records, page=1, limit=DEFAULT_LIMIT):
+    limit = clamp_limit(limit)
+    page = max(page or 1, 1)
+    return Page(records, min((page - 1) * limit, max(len(records) - 1, 0) // limit * limit), limit)
+
+
+def paginate_request(records):
+    return paginate(records, request.args.get('page', 1, type=int),
+                    request.args.get('limit', DEFAULT_LIMIT, type=int))
+
+
+# --- opaque cursors for the JSON listings ---
+# A cursor is the key of the last row served (its id, or its link for
+# catalogs without ids), that row's position and the data version it was
+# issued against. Under the same version the position is used as is. After
+# a write the row is looked up again: appends leave it in place, while
+# compaction or an ingest rewrite may move it, and the key finds where it
+# went. A cursor whose row is gone (or a catalog with no key column) gets
+# ValueError rather than a page that skips or repeats rows.
+
+CURSOR_KEYS = ('id', 'link', 'url', 'website')
+
+
+def version_tag(signature):
+    if not signature:
+        return '0'
+    return '%x-%x' % tuple(signature)
+
+
+def key_field(records):
+    if not len(records):
+        return None
+    lowered = {str(k).lower(): k for k in records[0]}
+    for name in CURSOR_KEYS:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+def _key(value):
+    return str(value).strip().casefold()
+
+
+def encode_cursor(key, offset, version):
+    raw = json.dumps([key, offset, version], separators=(',', ':'), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    # returns (key, offset, version); raises ValueError for anything malformed
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key, offset, version = json.loads(raw)
+    except Exception:
+        raise ValueError('invalid cursor')
+    if not isinstance(offset, int) or offset < 0 or not isinstance(key, (str, type(None))):
+        raise ValueError('invalid cursor')
+    return key, offset, version
+
+
+def resume_offset(records, cursor, version):
+    # position after the cursor's row in records (the current version)
+    key, offset, issued = decode_cursor(cursor)
+    if issued == version:
+        return offset
+    field = key_field(records)
+    if field is None or key is None:
+        raise ValueError('cursor expired')
+    if 0 < offset <= len(records) and _key(records[offset - 1].get(field, '')) == key:
+        return offset
+    for position, value in enumerate(column_values(records, field)):
+        if _key(value) == key:
+            return position + 1
+    raise ValueError('cursor expired')
+
+
+def paginate_cursor(records, cursor=None, limit=DEFAULT_LIMIT, version='0', page=None):
+    # page (1-based, as on the HTML listings) is a starting point when there's no cursor
+    limit = clamp_limit(limit)
+    if cursor:
+        offset = resume_offset(records, cursor, version)
+    else:
+        offset = (max(page or 1, 1) - 1) * limit
+    page = Page(records, offset, limit)
+    page.next_cursor = None
+    if page.has_next:
+        field = key_field(records)
+        last = _key(page.items[-1].get(field, '')) if field is not None else None
+        page.next_cursor = encode_cursor(last, offset + limit, version)
+    return page
+
+
+def page_url(number):
+    # url of the current listing at another page, keeping the other query args
+    args = request.args.to_dict()
+    args['page'] = number
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
@@ -0,0 +1,217 @@
+import json
+import os
+import threading
+
+from catalog_cache import catalog_cache, file_signature
+from metrics import timed
+from search_index import TITLE_FIELDS, LINK_FIELDS, tokenize, _field
+
+# "Related items" across catalogs, precomputed offline.
+#
+# build() turns every item into a TF-IDF vector (sublinear tf, smoothed idf,
+# L2-normalized) over its title/description/program-like fields, kept as a
+# CSR matrix built from numpy arrays (scipy is not available). Rows are
+# scored in batches through the term -> items postings and the top-k
+# neighbours of every item are kept, so memory is O(non-zeros) plus one
+# bounded batch of similarities. The result is saved to an .npz next to the data, so
+# a request is a dict lookup plus a slice. Terms that occur in a single item
+# cannot make two items similar and are dropped after normalization (cosines
+# stay exact); RELATED_MAX_FEATURES optionally caps the vocabulary at the
+# most frequent terms beyond that.
+# Items are identified by their 'id' column, or their 1-based row number in
+# catalogs without one.
+
+TEXT_FIELDS = ('title', 'course', 'hackathon', 'scholarship', 'institution', 'program', 'level',
+               'role', 'company', 'platform', 'description', 'focus')
+STOPWORDS = frozenset('a an and are as at be by for from in into is it of on or the to with your you'.split())
+TOP_K = int(os.getenv('RELATED_TOP_K', '5'))
+MAX_FEATURES = int(os.getenv('RELATED_MAX_FEATURES', '0'))  # 0: keep every shared term
+BATCH = 1024
+SIMS_BUDGET = 16 << 20  # similarity cells per batch (64 MiB of float32)
+
+
+def item_text(record):
+    lowered = {str(k).lower(): v for k, v in record.items()}
+    return ' '.join(str(lowered[f]) for f in TEXT_FIELDS if lowered.get(f) not in (None, ''))
+
+
+def item_title(record):
+    title = _field(record, TITLE_FIELDS)
+    program = _field(record, ('program',))
+    return f'{title} - {program}' if program and program != title else title
+
+
+def item_id(record, row):
+    try:
+        return int(record.get('id') or row)
+    except (TypeError, ValueError):
+        return row
+
+
+def tfidf(docs):
+    # docs: iterable of [token] -> ((indptr, indices, data) CSR rows of the
+    # L2-normalized float32 matrix over the kept terms, kept vocabulary)
+    import numpy as np
+    vocab = {}
+    lengths, cols, counts = [], [], []
+    for tokens in docs:
+        tf = {}
+        for t in tokens:
+            # bare numbers (ids, years, durations) say nothing about the topic
+            if t not in STOPWORDS and not t.isdigit():
+                j = vocab.setdefault(t, len(vocab))
+                tf[j] = tf.get(j, 0) + 1
+        lengths.append(len(tf))
+        cols.extend(tf)
+        counts.extend(tf.values())
+    n = len(lengths)
+    rows = np.repeat(np.arange(n, dtype='int64'), lengths)
+    cols = np.array(cols, dtype='int64')
+    df = np.bincount(cols, minlength=len(vocab))
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = (1 + np.log(np.array(counts, dtype='float64'))) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n))
+    weights /= np.where(norms > 0, norms, 1)[rows]
+    keep = np.flatnonzero(df >= 2)
+    if MAX_FEATURES and len(keep) > MAX_FEATURES:
+        keep = keep[np.argsort(-df[keep], kind='stable')[:MAX_FEATURES]]
+    column = np.full(len(vocab), -1, dtype='int64')
+    column[keep] = np.arange(len(keep))
+    mask = column[cols] >= 0
+    indptr = np.zeros(n + 1, dtype='int64')
+    np.cumsum(np.bincount(rows[mask], minlength=n), out=indptr[1:])
+    terms = sorted(vocab, key=vocab.get)
+    return (indptr, column[cols[mask]], weights[mask].astype('float32')), [terms[j] for j in keep]
+
+
+def top_neighbours(csr, n_terms, k):
+    # (indices, scores) of the k most similar other rows per row; -1 / 0 pad.
+    # A batch of rows is scored through the term -> rows postings, so besides
+    # the O(nnz) matrix only one batch x n block of similarities is in memory.
+    import numpy as np
+    indptr, cols, data = csr
+    n = len(indptr) - 1
+    k = max(0, min(k, n - 1))
+    indices = np.full((n, k), -1, dtype='int32')
+    scores = np.zeros((n, k), dtype='float32')
+    if not k:
+        return indices, scores
+    rows = np.repeat(np.arange(n, dtype='int64'), np.diff(indptr))
+    order = np.argsort(cols, kind='stable')
+    post_rows, post_data = rows[order], data[order]
+    post_ptr = np.zeros(n_terms + 1, dtype='int64')
+    np.cumsum(np.bincount(cols, minlength=n_terms), out=post_ptr[1:])
+    step = max(1, min(BATCH, SIMS_BUDGET // n))
+    for start in range(0, n, step):
+        end = min(n, start + step)
+        lo, hi = indptr[start], indptr[end]
+        order = np.argsort(cols[lo:hi], kind='stable')
+        b_rows, b_cols, b_data = rows[lo:hi][order] - start, cols[lo:hi][order], data[lo:hi][order]
+        sims = np.zeros((end - start, n), dtype='float32')
+        if len(b_cols):
+            bounds = np.flatnonzero(np.diff(b_cols)) + 1
+            firsts = np.concatenate(([0], bounds))
+            for t, r, w in zip(b_cols[firsts].tolist(), np.split(b_rows, bounds), np.split(b_data, bounds)):
+                p = slice(post_ptr[t], post_ptr[t + 1])
+                sims[np.ix_(r, post_rows[p])] += np.outer(w, post_data[p])
+        batch = np.arange(end - start)
+        sims[batch, batch + start] = -1
+        part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(sims, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind='stable')
+        part = np.take_along_axis(part, order, axis=1)
+        part_scores = np.take_along_axis(part_scores, order, axis=1)
+        found = part_scores > 0
+        indices[start:end] = np.where(found, part, -1)
+        scores[start:end] = np.where(found, part_scores, 0)
+    return indices, scores
+
+
+class RelatedIndex:
+
+    def __init__(self, catalogs, path):
+        # catalogs: name -> csv path; path: where the built index is stored
+        self.catalogs = dict(catalogs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._sig = None
+        self._items = []  # [(catalog, id, title, link)]
+        self._lookup = {}  # (catalog, id) -> row
+        self._indices = None
+        self._scores = None
+
+    def sources(self):
+        # signatures of the CSVs an index was built from, as stored with it
+        return json.dumps({name: list(file_signature(p) or ()) for name, p in self.catalogs.items()}, sort_keys=True)
+
+    def stale(self):
+        import numpy as np
+        try:
+            with np.load(self.path) as data:
+                return str(data['sources']) != self.sources()
+        except (OSError, KeyError, ValueError):
+            return True
+
+    def build(self, k=TOP_K):
+        import numpy as np
+        with timed('related_build'):
+            sources = self.sources()
+            items = []
+
+            def docs():
+                for name, path in self.catalogs.items():
+                    for row, record in enumerate(catalog_cache.get(path), 1):
+                        items.append((name, item_id(record, row), item_title(record), _field(record, LINK_FIELDS)))
+                        yield tokenize(item_text(record))
+            csr, terms = tfidf(docs())
+            indices, scores = top_neighbours(csr, len(terms), k)
+            tmp = self.path + '.tmp.npz'
+            np.savez(tmp,
+                     sources=np.array(sources),
+                     catalog=np.array([i[0] for i in items], dtype=str),
+                     ids=np.array([i[1] for i in items], dtype='int64'),
+                     title=np.array([i[2] for i in items], dtype=str),
+                     link=np.array([i[3] for i in items], dtype=str),
+                     indices=indices, scores=scores)
+            os.replace(tmp, self.path)
+        return len(items), len(terms)
+
+    def _load(self):
+        # (re)load the saved index when the file on disk changed
+        import numpy as np
+        sig = file_signature(self.path)
+        if sig == self._sig:
+            return
+        with self._lock:
+            if sig == self._sig:
+                return
+            try:
+                with np.load(self.path) as data:
+                    items = list(zip(data['catalog'].tolist(), data['ids'].tolist(),
+                                     data['title'].tolist(), data['link'].tolist()))
+                    indices, scores = data['indices'], data['scores']
+            except (OSError, KeyError, ValueError):
+                items, indices, scores = [], None, None
+            self._items = items
+            self._lookup = {(c, i): row for row, (c, i, _, _) in enumerate(items)}
+            self._indices, self._scores = indices, scores
+            self._sig = sig
+
+    def related(self, catalog, item, limit=TOP_K):
+        # [{catalog, id, title, link, score}] or None when the item is unknown
+        self._load()
+        row = self._lookup.get((catalog, item))
+        if row is None:
+            return None
+        out = []
+        limit = max(0, limit)
+        for j, score in zip(self._indices[row][:limit].tolist(), self._scores[row][:limit].tolist()):
+            if j < 0:
+                break
+            c, i, title, link = self._items[j]
+            out.append({'catalog': c, 'id': i, 'title': title, 'link': link, 'score': round(score, 4)})
+        return out
+
+    def stats(self):
+        self._load()
+        return {'items': len(self._items)}
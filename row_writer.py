@@ -0,0 +1,182 @@
+import csv
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from catalog_cache import file_signature
+from metrics import timed
+
+# Append-only CSV writes shared by every worker process. Each CSV gets two
+# sidecar files next to it:
+#   <file>.lock  advisory fcntl lock taken around every append/compaction
+#   <file>.seq   last allocated id, append counter and the file signature
+#                they were computed against (a mismatch means the CSV was
+#                edited out of band and the max id is rescanned once)
+
+COMPACT_EVERY = int(os.getenv('CSV_COMPACT_EVERY', '1000'))
+
+_schemas = {}
+_held = threading.local()
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def register_schema(path, headers):
+    _schemas[path] = [h for h in headers if h]
+
+
+def schema_for(path):
+    return _schemas.get(path)
+
+
+@contextmanager
+def file_lock(path):
+    # exclusive advisory lock; re-entrant within the same thread
+    held = getattr(_held, 'paths', None)
+    if held is None:
+        held = _held.paths = set()
+    if path in held:
+        yield
+        return
+    with open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_header(path):
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), [])
+    except FileNotFoundError:
+        return []
+
+
+def _scan_max_id(path, id_field):
+    max_id = 0
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    max_id = max(max_id, int(row.get(id_field) or 0))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return max_id
+
+
+def _read_state(path):
+    try:
+        with open(path + '.seq', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_state(path, state):
+    tmp = path + '.seq.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, path + '.seq')
+
+
+def _check_row(path, headers, row):
+    schema = schema_for(path)
+    if schema is not None and headers and headers != schema:
+        raise SchemaError(f'{os.path.basename(path)} header {headers} does not match schema {schema}')
+    unknown = set(row) - set(headers or schema or row)
+    if unknown:
+        raise SchemaError(f'unknown columns for {os.path.basename(path)}: {sorted(unknown)}')
+
+
+def append_row(path, row, id_field=None):
+    # O(1) append of one row; returns the row as written (with its id if allocated)
+    with timed('csv_write'), file_lock(path):
+        headers = _read_header(path)
+        _check_row(path, headers, row)
+        if not headers:
+            headers = schema_for(path) or list(row)
+        state = _read_state(path)
+        sig = list(file_signature(path) or ())
+        if state.get('sig') != sig:
+            state = {'last_id': _scan_max_id(path, id_field) if id_field else 0,
+                     'appends': state.get('appends', 0)}
+        row = dict(row)
+        if id_field:
+            last_id = _int(state.get('last_id'))
+            if row.get(id_field):
+                last_id = max(last_id, _int(row[id_field]))
+            else:
+                last_id += 1
+                row[id_field] = last_id
+            state['last_id'] = last_id
+
+        write_header = os.path.getsize(path) == 0 if os.path.exists(path) else True
+        with open(path, 'a+', newline='', encoding='utf-8') as f:
+            f.seek(0, 2)
+            end = f.tell()
+            if end > 0:
+                f.seek(end - 1)
+                if f.read(1) not in ('\n', '\r'):
+                    f.write('\n')
+            writer = csv.DictWriter(f, fieldnames=headers, extrasaction='ignore', lineterminator='\n')
+            if write_header:
+                writer.writeheader()
+            writer.writerow({h: row.get(h, '') for h in headers})
+
+        state['appends'] = state.get('appends', 0) + 1
+        if COMPACT_EVERY and state['appends'] >= COMPACT_EVERY:
+            compact(path, id_field=id_field)
+            state['appends'] = 0
+        state['sig'] = list(file_signature(path) or ())
+        _write_state(path, state)
+        return row
+
+
+def _int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def compact(path, id_field=None):
+    # rewrite the file without blank lines; with id_field the last row per id wins.
+    # Written to a temp file and renamed so readers never see a partial file.
+    with timed('csv_write'), file_lock(path):
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                headers = next(reader, [])
+                rows = [r for r in reader if any(cell.strip() for cell in r)]
+        except FileNotFoundError:
+            return 0
+        if id_field and id_field in headers:
+            col = headers.index(id_field)
+            latest = {}
+            for r in rows:
+                key = r[col] if col < len(r) else ''
+                latest.pop(key, None)
+                latest[key] = r
+            rows = list(latest.values())
+        tmp = path + '.compact.tmp'
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(headers)
+            writer.writerows(rows)
+        os.replace(tmp, path)
+        state = _read_state(path)
+        if state:
+            state['sig'] = list(file_signature(path) or ())
+            state['appends'] = 0
+            _write_state(path, state)
+        return len(rows)
@@ -0,0 +1,168 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+from catalog_cache import catalog_cache, file_signature
+
+# One inverted index over every catalog CSV. Documents are scored with BM25;
+# the last query term can be matched as a prefix for type-ahead. Each catalog
+# is indexed separately, so a change to one CSV only reindexes that catalog.
+# Documents are positions into the catalog's records; only the rows a query
+# returns are fetched from them.
+
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_TERMS = 50
+
+# first column found (case-insensitive) is used as the result title / link
+TITLE_FIELDS = ('title', 'course', 'hackathon', 'scholarship', 'institution', 'role', 'question', 'platform')
+LINK_FIELDS = ('link', 'url', 'website')
+
+_token_re = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    return _token_re.findall(str(text).lower())
+
+
+def _field(record, names):
+    lowered = {str(k).lower(): v for k, v in record.items()}
+    for name in names:
+        value = lowered.get(name)
+        if value not in (None, ''):
+            return str(value)
+    return ''
+
+
+class SearchIndex:
+
+    def __init__(self, catalogs):
+        # catalogs: name -> csv path
+        self.catalogs = dict(catalogs)
+        self._lock = threading.RLock()
+        self._docs = {}  # doc id -> (catalog, position, length)
+        self._catalog_docs = {}  # catalog -> range of doc ids
+        self._catalog_terms = {}  # catalog -> terms it contributed
+        self._records = {}  # catalog -> the records its doc positions refer to
+        self._postings = {}  # term -> {doc id: tf}
+        self._vocab = []  # sorted terms, rebuilt lazily for prefix lookups
+        self._vocab_dirty = False
+        self._total_len = 0
+        self._next_doc = 0
+        self._sigs = {}
+
+    # --- indexing ---
+    def _drop_catalog(self, name):
+        doc_ids = self._catalog_docs.pop(name, range(0))
+        for doc_id in doc_ids:
+            self._total_len -= self._docs.pop(doc_id)[2]
+        for term in self._catalog_terms.pop(name, ()):
+            plist = self._postings[term]
+            for doc_id in [d for d in plist if d in doc_ids]:
+                del plist[doc_id]
+            if not plist:
+                del self._postings[term]
+                self._vocab_dirty = True
+        self._records.pop(name, None)
+
+    def _index_catalog(self, name):
+        path = self.catalogs[name]
+        self._drop_catalog(name)
+        first = self._next_doc
+        terms = set()
+        records = catalog_cache.get(path)
+        for position, record in enumerate(records):
+            tokens = []
+            for value in record.values():
+                tokens.extend(tokenize(value))
+            if not tokens:
+                continue
+            doc_id = self._next_doc
+            self._next_doc += 1
+            self._docs[doc_id] = (name, position, len(tokens))
+            self._total_len += len(tokens)
+            for term, tf in Counter(tokens).items():
+                plist = self._postings.get(term)
+                if plist is None:
+                    plist = self._postings[term] = {}
+                    self._vocab_dirty = True
+                plist[doc_id] = tf
+                terms.add(term)
+        self._catalog_docs[name] = range(first, self._next_doc)
+        self._catalog_terms[name] = terms
+        self._records[name] = records
+        self._sigs[name] = file_signature(path)
+
+    def refresh(self):
+        # reindex only the catalogs whose CSV changed since they were indexed
+        changed = [name for name, path in self.catalogs.items()
+                   if name not in self._sigs or file_signature(path) != self._sigs[name]]
+        if changed:
+            with self._lock:
+                for name in changed:
+                    self._index_catalog(name)
+        return changed
+
+    def _prefix_terms(self, prefix):
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        lo = bisect.bisect_left(self._vocab, prefix)
+        hi = bisect.bisect_left(self._vocab, prefix + '￿')
+        terms = self._vocab[lo:hi]
+        if len(terms) > MAX_PREFIX_TERMS:
+            terms = heapq.nlargest(MAX_PREFIX_TERMS, terms, key=lambda t: len(self._postings[t]))
+        return terms
+
+    # --- querying ---
+    def search(self, query, catalog=None, limit=20, offset=0, prefix=False):
+        self.refresh()
+        terms = tokenize(query)
+        if not terms:
+            return {'query': query, 'total': 0, 'facets': {}, 'results': []}
+        with self._lock:
+            n_docs = len(self._docs) or 1
+            avgdl = self._total_len / n_docs
+            scores = {}
+            groups = [[t] for t in terms[:-1]]
+            groups.append(self._prefix_terms(terms[-1]) if prefix else [terms[-1]])
+            for group in groups:
+                # a prefix group counts once per document, with its best expansion
+                best = {}
+                for term in group:
+                    plist = self._postings.get(term)
+                    if not plist:
+                        continue
+                    idf = math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+                    for doc_id, tf in plist.items():
+                        length = self._docs[doc_id][2]
+                        s = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgdl))
+                        if s > best.get(doc_id, 0.0):
+                            best[doc_id] = s
+                for doc_id, s in best.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + s
+
+            facets = Counter(self._docs[d][0] for d in scores)
+            if catalog:
+                scores = {d: s for d, s in scores.items() if self._docs[d][0] == catalog}
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda kv: (kv[1], -kv[0]))[offset:]
+            results = []
+            for doc_id, score in top:
+                name, position, _ = self._docs[doc_id]
+                record = self._records[name][position]
+                results.append({
+                    'catalog': name,
+                    'title': _field(record, TITLE_FIELDS),
+                    'link': _field(record, LINK_FIELDS),
+                    'score': round(score, 4),
+                    'record': record,
+                })
+        return {'query': query, 'total': len(scores), 'facets': dict(facets), 'results': results}
+
+    def stats(self):
+        with self._lock:
+            return {'documents': len(self._docs), 'terms': len(self._postings),
+                    'catalogs': {n: len(d) for n, d in self._catalog_docs.items()}}
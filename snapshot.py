@@ -0,0 +1,228 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Sequence
+
+from catalog_cache import file_signature
+from metrics import timed
+
+# Compiled, memory-mapped copies of the catalog CSVs.
+#
+# A snapshot is a directory next to the CSV (snapshots/<stem>-<mtime>-<size>/)
+# holding one .npy per column plus a manifest. Numeric columns are stored as
+# numpy arrays; text columns are int32 codes into one interned string table
+# (utf-8 blob + offsets) shared by every column of the catalog. Workers open
+# the arrays with mmap_mode='r', so the pages live once in the OS page cache
+# and are shared by every process instead of each worker holding its own
+# parsed copy. The directory name carries the CSV signature: when the CSV
+# changes the next lookup builds a new snapshot (atomically, via rename) and
+# older ones are removed; processes still mapping them keep working.
+
+SNAPSHOT_DIR = 'snapshots'
+MANIFEST = 'manifest.json'
+
+_lock = threading.Lock()
+_stats = {'builds': 0, 'loads': 0, 'failures': 0}
+
+
+def snapshot_path(path, sig):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), SNAPSHOT_DIR, f'{stem}-{sig[0]}-{sig[1]}')
+
+
+def build(path):
+    # compile the CSV into a snapshot for its current signature; returns the directory
+    import numpy as np
+    import pandas as pd
+    sig = file_signature(path)
+    if sig is None:
+        raise FileNotFoundError(path)
+    target = snapshot_path(path, sig)
+    if os.path.isdir(target):
+        return target
+    with timed('snapshot_build'):
+        df = pd.read_csv(path)
+        root = os.path.dirname(target)
+        os.makedirs(root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=root, prefix='.tmp-')
+        try:
+            columns = []
+            text = []
+            for i, name in enumerate(df.columns):
+                col = df[name]
+                entry = {'name': str(name), 'file': f'col{i}.npy'}
+                if col.dtype.kind in 'iub':
+                    entry['kind'] = 'bool' if col.dtype.kind == 'b' else 'int'
+                    np.save(os.path.join(tmp, entry['file']), col.to_numpy())
+                elif col.dtype.kind == 'f':
+                    entry['kind'] = 'float'
+                    np.save(os.path.join(tmp, entry['file']), col.to_numpy(dtype='float64'))
+                else:
+                    entry['kind'] = 'str'
+                    text.append((entry['file'], col.map(lambda v: v if isinstance(v, str) or v != v else str(v))))
+                columns.append(entry)
+            # one interned string table for all text columns
+            n = len(df)
+            if text:
+                codes, strings = pd.factorize(pd.concat([values for _, values in text], ignore_index=True))
+                codes = codes.astype('int32')
+                for k, (file, _) in enumerate(text):
+                    np.save(os.path.join(tmp, file), codes[k * n:(k + 1) * n])
+            else:
+                strings = []
+            encoded = [s.encode('utf-8') for s in strings]
+            offsets = np.zeros(len(encoded) + 1, dtype='int64')
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            np.save(os.path.join(tmp, 'strings.npy'), np.frombuffer(b''.join(encoded), dtype='uint8'))
+            np.save(os.path.join(tmp, 'offsets.npy'), offsets)
+            with open(os.path.join(tmp, MANIFEST), 'w', encoding='utf-8') as f:
+                json.dump({'source': os.path.basename(path), 'signature': list(sig),
+                           'rows': n, 'columns': columns}, f)
+            try:
+                os.rename(tmp, target)
+            except OSError:
+                # another worker published the same version first
+                if not os.path.isdir(target):
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    with _lock:
+        _stats['builds'] += 1
+    _remove_stale(path, target)
+    return target
+
+
+def _remove_stale(path, keep):
+    root = os.path.dirname(keep)
+    prefix = os.path.splitext(os.path.basename(path))[0] + '-'
+    for name in os.listdir(root):
+        full = os.path.join(root, name)
+        if full != keep and name.startswith(prefix) and name[len(prefix):].count('-') == 1:
+            shutil.rmtree(full, ignore_errors=True)
+
+
+class SnapshotRecords(Sequence):
+    # Read-only list of record dicts backed by a mapped snapshot. Rows are
+    # materialized on every access (indexing, slicing, iteration) with the
+    # same values parse_csv_records would give: text and missing values as ''
+    # and numbers as python int/float. Nothing is kept, so hot paths should
+    # not scan rows: values() and where() work on the columns directly.
+
+    def __init__(self, directory):
+        import numpy as np
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.signature = tuple(manifest['signature'])
+        self._rows = manifest['rows']
+        self._strings = np.load(os.path.join(directory, 'strings.npy'), mmap_mode='r')
+        self._offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode='r')
+        self._columns = [(c['name'], c['kind'], np.load(os.path.join(directory, c['file']), mmap_mode='r'))
+                         for c in manifest['columns']]
+
+    def __len__(self):
+        return self._rows
+
+    def string(self, code):
+        if code < 0:
+            return ''
+        start, end = self._offsets[code], self._offsets[code + 1]
+        return self._strings[start:end].tobytes().decode('utf-8')
+
+    def _value(self, kind, v):
+        if kind == 'str':
+            return self.string(int(v))
+        if kind == 'float':
+            v = float(v)
+            return '' if v != v else v
+        return int(v) if kind == 'int' else bool(v)
+
+    def _row(self, i):
+        return {name: self._value(kind, values[i]) for name, kind, values in self._columns}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError(index)
+        return self._row(index)
+
+    def _column(self, name):
+        for col, kind, values in self._columns:
+            if col == name:
+                return kind, values
+        raise KeyError(name)
+
+    def column(self, name):
+        # raw mapped array of a column (codes for text columns)
+        return self._column(name)[1]
+
+    def values(self, name):
+        # python values of one column, in row order
+        import numpy as np
+        kind, values = self._column(name)
+        if kind != 'str':
+            return [self._value(kind, v) for v in values.tolist()]
+        codes, inverse = np.unique(values, return_inverse=True)
+        strings = [self.string(c) for c in codes.tolist()]
+        return [strings[j] for j in inverse.tolist()]
+
+    def where(self, filters):
+        # positions of the rows where every (column, value) matches the column's
+        # stripped, casefolded text; each distinct value is decoded once
+        import numpy as np
+        mask = np.ones(self._rows, dtype=bool)
+        for name, wanted in filters:
+            kind, values = self._column(name)
+            distinct = np.unique(values).tolist()
+            hits = [v for v in distinct if str(self._value(kind, v)).strip().casefold() == wanted]
+            match = np.isin(values, hits)
+            if kind == 'float' and not wanted:
+                match |= np.isnan(values)  # missing numbers read as ''
+            mask &= match
+        return np.flatnonzero(mask).tolist()
+
+
+def load(path):
+    # records for the CSV's current version, building the snapshot when it is
+    # missing or older than the CSV; None when the CSV cannot be compiled
+    for _ in range(2):
+        try:
+            sig = file_signature(path)
+            if sig is None:
+                return None
+            directory = snapshot_path(path, sig)
+            if not os.path.isdir(directory):
+                directory = build(path)
+            records = SnapshotRecords(directory)
+        except FileNotFoundError:
+            # a concurrent rebuild removed the version we were opening; retry once
+            continue
+        except Exception:
+            break
+        with _lock:
+            _stats['loads'] += 1
+        return records
+    with _lock:
+        _stats['failures'] += 1
+    return None
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def stats():
+    with _lock:
+        out = dict(_stats)
+    out['rss_bytes'] = rss_bytes()
+    return out
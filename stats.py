@@ -0,0 +1,147 @@
+import abc
+import csv
+import io
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from metrics import timed
+
+# Dashboard aggregates kept materialized per worker. Each aggregate remembers
+# how far into its CSV it has read; since the app only ever appends rows, a
+# refresh just folds in the new tail (from any worker). The last bytes read
+# are kept as a guard: if the file shrank, was replaced, or no longer holds
+# those bytes right before the offset (rewritten in place by compaction, an
+# editor or pandas) it is rebuilt from scratch. A refresh with no change
+# costs one stat().
+
+GUARD_BYTES = 64
+
+
+class CsvAggregate(abc.ABC):
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._inode = None
+        self._mtime = None
+        self._offset = 0
+        self._guard = b''
+        self._header = None
+        self.reset()
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+    @abc.abstractmethod
+    def add(self, row):
+        pass
+
+    def _restart(self, inode):
+        self._inode, self._offset, self._guard, self._header = inode, 0, b'', None
+        self.reset()
+
+    def refresh(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            with self._lock:
+                self._mtime = None
+                self._restart(None)
+            return
+        with self._lock:
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                self._restart(st.st_ino)
+            elif st.st_size == self._offset:
+                if st.st_mtime_ns == self._mtime:
+                    return
+                # same size, new mtime: nothing was appended, so it was rewritten
+                self._restart(st.st_ino)
+            with timed('csv_read'), open(self.path, 'rb') as f:
+                f.seek(self._offset - len(self._guard))
+                chunk = f.read()
+            if not chunk.startswith(self._guard):
+                self._restart(st.st_ino)
+                with timed('csv_read'), open(self.path, 'rb') as f:
+                    chunk = f.read()
+            chunk = chunk[len(self._guard):]
+            self._mtime = st.st_mtime_ns
+            # only consume complete lines; a row being written right now is picked up next time
+            end = chunk.rfind(b'\n') + 1
+            if not end:
+                return
+            self._offset += end
+            self._guard = (self._guard + chunk[:end])[-GUARD_BYTES:]
+            reader = csv.reader(io.StringIO(chunk[:end].decode('utf-8')))
+            if self._header is None:
+                self._header = next(reader, None)
+            for values in reader:
+                if any(v.strip() for v in values):
+                    self.add(dict(zip(self._header, values)))
+
+
+class UserStats(CsvAggregate):
+    # users.csv gets another copy of a user's row whenever their password hash
+    # is upgraded, so users are counted by id, on the date of their first row
+
+    def reset(self):
+        self.created = {}  # id -> registration date (None if unparseable)
+        self.daily = Counter()
+
+    @property
+    def total(self):
+        return len(self.created)
+
+    def add(self, row):
+        key = (row.get('id') or '').strip() or (row.get('email') or '').strip().casefold()
+        if not key or key in self.created:
+            return
+        try:
+            day = datetime.fromisoformat(row.get('created_at', '')).date()
+        except ValueError:
+            day = None
+        self.created[key] = day
+        if day is not None:
+            self.daily[day] += 1
+
+
+class CategoryStats(CsvAggregate):
+
+    def __init__(self, path, column='category'):
+        self.column = column
+        super().__init__(path)
+
+    def reset(self):
+        self.counts = Counter()
+
+    def add(self, row):
+        value = (row.get(self.column) or '').strip()
+        if value:
+            self.counts[value] += 1
+
+
+class SiteStats:
+
+    def __init__(self, users_csv, resources_csv):
+        self.users = UserStats(users_csv)
+        self.resources = CategoryStats(resources_csv)
+
+    def refresh(self):
+        self.users.refresh()
+        self.resources.refresh()
+
+    def total_users(self):
+        return self.users.total
+
+    def registrations_per_day(self):
+        # [(date, count)] oldest first
+        return sorted(self.users.daily.items())
+
+    def resource_categories(self):
+        return dict(self.resources.counts.most_common())
+
+    def snapshot(self):
+        return {'total_users': self.users.total, 'registration_days': len(self.users.daily),
+                'resource_categories': len(self.resources.counts)}
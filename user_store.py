@@ -0,0 +1,87 @@
+import threading
+
+from row_writer import append_row, file_lock
+from stats import CsvAggregate
+
+
+def normalize_email(email):
+    return (email or '').strip().casefold()
+
+
+class _EmailIndex(CsvAggregate):
+    # case-folded email -> latest row; a later row for the same user (e.g. a
+    # password upgrade) replaces the earlier one
+
+    def reset(self):
+        self.by_email = {}
+
+    def add(self, row):
+        row = {k: (v if v is not None else '') for k, v in row.items() if k is not None}
+        try:
+            row['id'] = int(row.get('id') or 0)
+        except ValueError:
+            pass
+        key = normalize_email(row.get('email'))
+        if key:
+            self.by_email[key] = row
+
+
+class UserStore:
+    # users.csv kept as an in-memory hash index (case-folded email -> row).
+    # New users are appended to the file (under the row_writer lock, which
+    # also allocates ids) instead of rewriting it. Lookups fold in whatever
+    # was appended since the last one (by this or any other worker) by
+    # reading only the new bytes; the index is rebuilt only when the file was
+    # replaced or rewritten (see stats.CsvAggregate).
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._index = _EmailIndex(path)
+
+    @property
+    def _by_email(self):
+        return self._index.by_email
+
+    def _refresh(self):
+        self._index.refresh()
+
+    def find(self, email):
+        with self._lock:
+            self._refresh()
+            row = self._by_email.get(normalize_email(email))
+            return dict(row) if row is not None else None
+
+    def add(self, name, email, password_hash, created_at):
+        # returns the new row, or None if the email is already registered
+        with self._lock, file_lock(self.path):
+            # re-check under the file lock so two workers can't register the same email
+            self._refresh()
+            key = normalize_email(email)
+            if key in self._by_email:
+                return None
+            row = append_row(self.path, {
+                'name': name,
+                'email': email,
+                'password_hash': password_hash,
+                'created_at': created_at,
+            }, id_field='id')
+            self._refresh()
+            return dict(row)
+
+    def update_password_hash(self, email, password_hash):
+        # appends a copy of the user's row with the new hash; compaction keeps the last row per id
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            key = normalize_email(email)
+            row = self._by_email.get(key)
+            if row is None:
+                return False
+            append_row(self.path, dict(row, password_hash=password_hash), id_field='id')
+            self._refresh()
+            return True
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._by_email)